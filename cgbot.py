@@ -13,29 +13,67 @@ import json
 import math
 import re
 import threading
+import asyncio
+import concurrent.futures
 import signal
+import abc
+import argparse
+import shlex
+import subprocess
 import os
 import shutil
+import gc
+import tracemalloc
+import linecache
+import contextlib
+import struct
+import mmap
+import hashlib
+import tempfile
+import multiprocessing
+from multiprocessing import shared_memory
 from datetime import datetime
-from typing import Dict, Optional, Any, List, Tuple
-from dataclasses import dataclass, field
+from typing import Dict, Optional, Any, List, Tuple, Callable
+from dataclasses import dataclass, field, replace
 from collections import deque
 
+try:
+    import aiohttp
+except ImportError:  # engine async bersifat opsional
+    aiohttp = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: rate limiter hanya dibagi antar thread
+    fcntl = None
+
 # ============== KONFIGURASI ==============
 VERSION = "5.0.0"
 API_BASE_URL = "https://api.crypto.games/v1"
-REQUEST_TIMEOUT = (2, 3)
+BET_DEADLINE = 5.0  # Batas waktu total satu bet termasuk retry (detik)
+REQUEST_TIMEOUT = (2, 3)  # Timeout (connect, read) awal sebelum ada cukup sampel latency
+TIMEOUT_FLOOR = (0.25, 0.5)
+TIMEOUT_CEILING = (min(4.0, BET_DEADLINE), BET_DEADLINE)  # Batas atas timeout adaptif
+TIMEOUT_MULTIPLIER = 3.0  # Timeout adaptif = p99 latency endpoint x multiplier
+TIMEOUT_MIN_SAMPLES = 20
+TIMEOUT_REFRESH = 128  # Hitung ulang p99 setiap N sampel
 MIN_BET = 0.00000001
 FAUCET_BALANCE = 0.00000050
 MIN_DELAY = 50
 MAX_RETRIES = 3
 SAVE_FILE = "bot_config.json"
+BENCH_BASELINE_FILE = "bench_baseline.json"
+PORTFOLIO_COINS = ("BTC", "LTC", "DOGE", "ETH")
+BALANCE_TTL = 30.0  # Detik sebelum balance cache dianggap basi
 
 # ============== DATA CLASSES ==============
 
 @dataclass
 class BetResult:
     """Hasil dari setiap taruhan"""
+    # Dibuat sekali per bet: tanpa __dict__ per instance
+    __slots__ = ('bet_id', 'roll', 'profit', 'balance', 'success', 'timestamp')
+    
     bet_id: int
     roll: float
     profit: float
@@ -64,6 +102,107 @@ class Strategy:
     take_profit_percentage: float = 50.0
     stop_loss_percentage: float = 50.0
     strategy_type: str = "preset"  # mining, daily_target, aggressive, etc.
+    stop_window: str = ""  # "1m"/"1h"/"24h": stop profit/loss dari window bergulir, "" = sesi
+
+# Panjang ladder win yang dihitung di depan, streak lebih panjang pakai pow
+WIN_LADDER_SIZE = 64
+
+# Window P&L bergulir: (label, span detik, jumlah bucket)
+ROLLING_WINDOWS = (
+    ("1m", 60, 60),
+    ("1h", 3600, 60),
+    ("24h", 86400, 96),
+)
+WINDOW_LABELS = tuple(label for label, _, _ in ROLLING_WINDOWS)
+
+# Kurva profit sesi: jumlah bucket min/max (genap) dan lebar sparkline
+CURVE_BUCKETS = 128
+CURVE_WIDTH = 48
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+@dataclass(frozen=True)
+class CompiledStrategy:
+    """Strategi dengan ladder bet dan aturan stop yang sudah dihitung
+    
+    Dibuat sekali saat strategi dipilih/di-swap sehingga loop taruhan hanya
+    melakukan lookup tabel, bukan pow() per bet.
+    """
+    strategy: Strategy
+    loss_ladder: Tuple[float, ...]
+    win_ladder: Tuple[float, ...]
+    max_fraction: float
+    min_fraction: float
+    stop_profit: float
+    stop_loss: float
+    max_losses: int
+    daily_target: bool
+    stop_window: str
+    
+    @classmethod
+    def compile(cls, strategy: Strategy) -> 'CompiledStrategy':
+        """Hitung ladder dan batas stop dari Strategy"""
+        max_losses = max(strategy.max_consecutive_losses, 0)
+        
+        if strategy.stop_window and strategy.stop_window not in WINDOW_LABELS:
+            raise ValueError(f"Unknown stop window: {strategy.stop_window}")
+        
+        if strategy.increase_on_loss:
+            loss_ladder = tuple(
+                strategy.bet_amount * (strategy.loss_increase_multiplier ** n)
+                for n in range(max_losses + 1)
+            )
+        else:
+            loss_ladder = ()
+        
+        if strategy.decrease_on_win:
+            win_ladder = tuple(
+                strategy.bet_amount * (strategy.win_decrease_multiplier ** n)
+                for n in range(WIN_LADDER_SIZE)
+            )
+        else:
+            win_ladder = ()
+        
+        return cls(
+            strategy=strategy,
+            loss_ladder=loss_ladder,
+            win_ladder=win_ladder,
+            max_fraction=strategy.max_bet_percentage / 100.0,
+            min_fraction=strategy.min_bet_percentage / 100.0,
+            stop_profit=strategy.auto_stop_profit,
+            stop_loss=strategy.auto_stop_loss,
+            max_losses=strategy.max_consecutive_losses,
+            daily_target=strategy.strategy_type == "daily_target",
+            stop_window=strategy.stop_window
+        )
+    
+    def next_bet(self, balance: float, consecutive_wins: int, consecutive_losses: int) -> float:
+        """Bet berikutnya sebelum pembulatan, sama dengan aturan calculate_next_bet"""
+        if consecutive_losses > 0 and self.loss_ladder:
+            base_bet = self.loss_ladder[min(consecutive_losses, len(self.loss_ladder) - 1)]
+        elif consecutive_wins > 0 and self.win_ladder:
+            if consecutive_wins < WIN_LADDER_SIZE:
+                base_bet = self.win_ladder[consecutive_wins]
+            else:
+                strat = self.strategy
+                base_bet = strat.bet_amount * (strat.win_decrease_multiplier ** consecutive_wins)
+        else:
+            base_bet = self.strategy.bet_amount
+        
+        # Apply percentage limits
+        base_bet = max(balance * self.min_fraction, min(base_bet, balance * self.max_fraction))
+        
+        # Ensure minimum bet
+        return max(base_bet, MIN_BET)
+    
+    def stop_reason(self, total_profit: float, drawdown: float, consecutive_losses: int) -> Optional[str]:
+        """Aturan stop yang tercapai ('profit', 'loss', 'streak') atau None"""
+        if self.stop_profit > 0 and total_profit >= self.stop_profit:
+            return 'profit'
+        if self.stop_loss > 0 and drawdown >= self.stop_loss:
+            return 'loss'
+        if self.max_losses > 0 and consecutive_losses >= self.max_losses:
+            return 'streak'
+        return None
 
 @dataclass
 class BotConfig:
@@ -76,6 +215,566 @@ class BotConfig:
     initial_balance: float = FAUCET_BALANCE
     session_start: float = 0.0
     daily_profit_target: float = 0.0  # Target profit harian
+    rate_limit: float = 0.0  # Bet/detik per API key lintas proses, 0 = nonaktif
+
+# ============== SHARED MEMORY ==============
+
+# Layout stats engine yang dipublikasikan ke shared memory
+ENGINE_STATS_FIELDS = [
+    ('running', '?'),
+    ('total_bets', 'q'),
+    ('total_wins', 'q'),
+    ('total_losses', 'q'),
+    ('total_profit', 'd'),
+    ('total_wagered', 'd'),
+    ('consecutive_wins', 'q'),
+    ('consecutive_losses', 'q'),
+    ('current_balance', 'd'),
+    ('bets_per_second', 'd'),
+    ('session_time', 'd'),
+    ('max_bet_used', 'd'),
+    ('min_bet_used', 'd'),
+    ('start_time', 'd'),
+    ('daily_progress', 'd'),
+]
+ENGINE_STATS_KEYS = [key for key, _ in ENGINE_STATS_FIELDS]
+ENGINE_REPLY_TIMEOUT = 2.0  # Detik menunggu jawaban proses engine lewat pipe
+
+class SeqlockStruct:
+    """Record berukuran tetap di atas buffer bersama, dilindungi seqlock
+    
+    Satu writer, banyak reader. Writer menaikkan sequence menjadi ganjil
+    sebelum menulis dan genap setelahnya; reader mengulang jika sequence
+    ganjil atau berubah selama membaca, sehingga reader tidak perlu lock.
+    Thread-thread writer dalam satu proses diserialkan oleh lock lokal.
+    """
+    
+    HEADER = struct.Struct("<Q")
+    
+    def __init__(self, buf, fields: List[Tuple[str, str]], offset: int = 0):
+        self.buf = buf
+        self.offset = offset
+        self.keys = [key for key, _ in fields]
+        self.body = struct.Struct("<" + "".join(fmt for _, fmt in fields))
+        self.body_offset = offset + self.HEADER.size
+        self.seq = self.HEADER.unpack_from(buf, offset)[0] & ~1
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def size_for(cls, fields: List[Tuple[str, str]]) -> int:
+        """Ukuran buffer yang dibutuhkan untuk layout tertentu"""
+        return cls.HEADER.size + struct.calcsize("<" + "".join(fmt for _, fmt in fields))
+    
+    def write(self, values: Tuple):
+        """Tulis satu record (hanya dari satu proses writer)"""
+        with self.lock:
+            self.HEADER.pack_into(self.buf, self.offset, self.seq + 1)
+            self.body.pack_into(self.buf, self.body_offset, *values)
+            self.seq += 2
+            self.HEADER.pack_into(self.buf, self.offset, self.seq)
+    
+    def read(self, retries: int = 100) -> Dict:
+        """Baca snapshot konsisten, dict kosong jika belum pernah ditulis"""
+        for _ in range(retries):
+            before = self.HEADER.unpack_from(self.buf, self.offset)[0]
+            if before == 0:
+                return {}
+            if before & 1:
+                continue
+            values = self.body.unpack_from(self.buf, self.body_offset)
+            if self.HEADER.unpack_from(self.buf, self.offset)[0] == before:
+                return dict(zip(self.keys, values))
+        return {}
+
+# ============== LIVE STATUS ==============
+
+# Layout file status per bot yang dibaca oleh 'cgbot top'
+STATUS_FIELDS = [
+    ('pid', 'q'),
+    ('updated', 'd'),
+    ('started', 'd'),
+    ('running', '?'),
+    ('balance', 'd'),
+    ('profit', 'd'),
+    ('bets', 'q'),
+    ('wins', 'q'),
+    ('losses', 'q'),
+    ('win_streak', 'q'),
+    ('loss_streak', 'q'),
+    ('bets_per_second', 'd'),
+    ('latency_p50', 'd'),
+    ('latency_p90', 'd'),
+    ('latency_p99', 'd'),
+    ('coin', '8s'),
+    ('strategy', '48s'),
+]
+STATUS_DIRECTORY = os.path.join(tempfile.gettempdir(), "cgbot-status")
+STATUS_INTERVAL = 0.1
+PROFILE_DEFAULT_SECONDS = 10.0
+PROFILE_INTERVAL = 0.005
+FAIRNESS_BINS = 20
+FAIRNESS_RUN_BINS = 10
+FAIRNESS_MIN_SAMPLES = 500
+FAIRNESS_CHECK_INTERVAL = 256
+FAIRNESS_Z_THRESHOLD = 4.0
+HOOK_EVENTS = ('bet', 'streak', 'stop', 'error', 'session_start', 'session_stop')
+HOOK_ALERT_EVENTS = ('streak', 'stop', 'error', 'session_start', 'session_stop')
+HOOK_QUEUE_SIZE = 4096
+HOOK_STREAK_LENGTH = 5  # Event streak pada panjang 5, 10, 20, 40, ...
+HOOK_EXEC_TIMEOUT = 10.0
+
+class StatusPublisher:
+    """Publikasi state live bot ke file mmap berukuran tetap
+    
+    Tool eksternal cukup mmap file yang sama dan membaca record seqlock,
+    tanpa IPC ke proses bot. Dari loop taruhan hanya ada satu pengecekan
+    waktu per bet; penulisan dibatasi setiap STATUS_INTERVAL.
+    """
+    
+    _counter = 0
+    
+    def __init__(self, bot: 'DiceBot'):
+        self.bot = bot
+        self.last_publish = 0.0
+        
+        StatusPublisher._counter += 1
+        os.makedirs(STATUS_DIRECTORY, exist_ok=True)
+        self.path = os.path.join(STATUS_DIRECTORY, f"{os.getpid()}-{StatusPublisher._counter}.status")
+        
+        size = SeqlockStruct.size_for(STATUS_FIELDS)
+        with open(self.path, 'wb') as f:
+            f.write(b"\0" * size)
+        self.file = open(self.path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.record = SeqlockStruct(self.map, STATUS_FIELDS)
+    
+    def maybe_publish(self):
+        """Publikasi jika interval sudah lewat (dipanggil per bet)"""
+        if time.monotonic() - self.last_publish >= STATUS_INTERVAL:
+            self.publish()
+    
+    def publish(self):
+        """Tulis snapshot state bot sekarang"""
+        bot = self.bot
+        stats = bot.stats
+        bet_times = bot.bet_times
+        
+        bps = 0.0
+        if len(bet_times) >= 2:
+            time_diff = bet_times[-1] - bet_times[0]
+            if time_diff > 0:
+                bps = len(bet_times) / time_diff
+        
+        p50, p90, p99 = bot.latency_percentiles()
+        
+        self.record.write((
+            os.getpid(),
+            time.time(),
+            stats['start_time'],
+            bot.running,
+            stats['current_balance'],
+            stats['total_profit'],
+            stats['total_bets'],
+            stats['total_wins'],
+            stats['total_losses'],
+            stats['consecutive_wins'],
+            stats['consecutive_losses'],
+            bps,
+            p50,
+            p90,
+            p99,
+            bot.config.coin.encode()[:8],
+            bot.config.strategy.name.encode()[:48],
+        ))
+        self.last_publish = time.monotonic()
+    
+    def close(self):
+        """Hapus file status"""
+        self.record = None
+        self.map.close()
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def _pid_alive(pid: int) -> bool:
+    """Cek apakah proses dengan pid tertentu masih hidup"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+def read_status_files() -> List[Dict]:
+    """Baca semua file status bot di host ini (file milik proses mati dihapus)"""
+    results = []
+    size = SeqlockStruct.size_for(STATUS_FIELDS)
+    
+    try:
+        names = sorted(os.listdir(STATUS_DIRECTORY))
+    except FileNotFoundError:
+        return results
+    
+    for name in names:
+        if not name.endswith(".status"):
+            continue
+        path = os.path.join(STATUS_DIRECTORY, name)
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < size:
+                    continue
+                with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as view:
+                    record = SeqlockStruct(view, STATUS_FIELDS).read()
+        except OSError:
+            continue
+        
+        if not record:
+            continue
+        if not _pid_alive(record['pid']):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        
+        record['coin'] = record['coin'].rstrip(b"\0").decode(errors='ignore')
+        record['strategy'] = record['strategy'].rstrip(b"\0").decode(errors='ignore')
+        results.append(record)
+    
+    return results
+
+# ============== PROFILER ==============
+
+# Fungsi bot yang dihitung sebagai kategori tertentu
+PROFILE_STATS_FUNCTIONS = {
+    '_handle_result', 'calculate_next_bet', 'check_stop_conditions', 'next_bet',
+    'stop_reason', 'publish_stats', 'publish', 'maybe_publish', 'update_stats_display',
+    'feed', 'record'
+}
+PROFILE_RENDER_FUNCTIONS = {
+    'print_bet_result', 'print_log', 'print_stats', 'print_shadow', 'create_box',
+    'create_horizontal_line', 'center_text', 'check_and_update_width'
+}
+PROFILE_NETWORK_MODULES = ('requests', 'urllib3', 'http', 'socket', 'ssl', 'aiohttp', 'yarl', 'multidict')
+
+class SamplingProfiler:
+    """Profiler sampling berbiaya rendah untuk satu thread
+    
+    Thread sampler membaca stack target lewat sys._current_frames() setiap
+    PROFILE_INTERVAL, tanpa hook di thread target. Hasilnya ditulis sebagai
+    collapsed stack (format flamegraph.pl / speedscope) dengan kategori
+    network, json, stats, rendering, sleeping atau other sebagai root.
+    
+    Untuk event loop async (loop diisi), sampel di select() dibedakan dari
+    coroutine sesi yang sedang menunggu: network jika ada sesi yang menunggu
+    response aiohttp, sleeping jika semua sesi ada di asyncio.sleep.
+    """
+    
+    def __init__(self, thread_id: int, duration: float, output: str,
+                 on_done: Optional[Callable[['SamplingProfiler'], None]] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.thread_id = thread_id
+        self.loop = loop
+        self.duration = duration
+        self.output = output
+        self.on_done = on_done
+        self.stacks: Dict[str, int] = {}
+        self.categories: Dict[str, int] = {}
+        self.samples = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        """Mulai sampling di thread terpisah"""
+        self.thread.start()
+    
+    @property
+    def active(self) -> bool:
+        return self.thread.is_alive()
+    
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        module = frame.f_globals.get('__name__', '?')
+        return f"{module}.{code.co_name}"
+    
+    def _loop_wait_category(self) -> str:
+        """Kategori event loop yang menunggu di select(), dari coroutine sesi yang menunggu"""
+        if self.loop is None:
+            return 'sleeping'
+        try:
+            tasks = list(asyncio.all_tasks(self.loop))
+        except RuntimeError:
+            return 'sleeping'
+        
+        for task in tasks:
+            awaitable = task.get_coro()
+            while awaitable is not None:
+                frame = getattr(awaitable, 'cr_frame', None)
+                if frame is not None and frame.f_globals.get('__name__', '').split('.', 1)[0] in PROFILE_NETWORK_MODULES:
+                    return 'network'
+                awaitable = getattr(awaitable, 'cr_await', None)
+        return 'sleeping'
+    
+    def _classify(self, frames: List) -> str:
+        """Kategori dari frame terdalam ke luar, yang pertama cocok menang"""
+        for depth, frame in enumerate(frames):
+            code = frame.f_code
+            module = frame.f_globals.get('__name__', '')
+            root = module.split('.', 1)[0]
+            
+            if depth == 0:
+                if root == 'selectors':
+                    return self._loop_wait_category()
+                line = linecache.getline(code.co_filename, frame.f_lineno)
+                if 'sleep(' in line:
+                    return 'sleeping'
+            if root in PROFILE_NETWORK_MODULES:
+                return 'network'
+            if root == 'json':
+                return 'json'
+            if code.co_name in PROFILE_RENDER_FUNCTIONS:
+                return 'rendering'
+            if code.co_name in PROFILE_STATS_FUNCTIONS:
+                return 'stats'
+        return 'other'
+    
+    def _run(self):
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            
+            category = self._classify(frames)
+            key = ";".join([category] + [self._frame_name(f) for f in reversed(frames)])
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.categories[category] = self.categories.get(category, 0) + 1
+            self.samples += 1
+            
+            del frames, frame
+            time.sleep(PROFILE_INTERVAL)
+        
+        self.write()
+        if self.on_done is not None:
+            self.on_done(self)
+    
+    def write(self):
+        """Tulis collapsed stack ke file output"""
+        with open(self.output, 'w') as f:
+            for key, count in sorted(self.stacks.items()):
+                f.write(f"{key} {count}\n")
+    
+    def summary(self) -> str:
+        """Ringkasan persentase waktu per kategori"""
+        if not self.samples:
+            return "no samples"
+        parts = sorted(self.categories.items(), key=lambda item: item[1], reverse=True)
+        return ", ".join(f"{name} {count / self.samples * 100:.0f}%" for name, count in parts)
+
+# ============== EVENT HOOKS ==============
+class HookSubscriber(abc.ABC):
+    """Subscriber event dengan antrian berbatas dan worker thread sendiri
+    
+    offer() hanya append ke deque (atomik di bawah GIL, tanpa lock) dan
+    membangunkan worker jika sedang idle. Saat antrian penuh event tertua
+    dibuang, sehingga subscriber yang lambat tidak pernah menahan loop taruhan.
+    """
+    
+    name = "hook"
+    DEFAULT_EVENTS = HOOK_EVENTS
+    
+    def __init__(self, events=None, maxlen: int = HOOK_QUEUE_SIZE):
+        self.events = frozenset(events or self.DEFAULT_EVENTS)
+        self.queue = deque(maxlen=maxlen)
+        self.dropped = 0
+        self.errors = 0
+        
+        self.waiting = False
+        self.closing = False
+        self.wakeup = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True, name=f"hook-{self.name}")
+        self.thread.start()
+    
+    def offer(self, event: Dict):
+        """Masukkan event ke antrian (dipanggil dari thread loop taruhan)"""
+        queue = self.queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(event)
+        if self.waiting:
+            self.wakeup.set()
+    
+    @abc.abstractmethod
+    def handle(self, event: Dict):
+        """Proses satu event (di worker thread)"""
+    
+    def flush(self):
+        """Dipanggil setelah antrian kosong"""
+    
+    def release(self):
+        """Lepaskan resource setelah worker berhenti"""
+    
+    def _run(self):
+        queue = self.queue
+        pending = False
+        while True:
+            try:
+                event = queue.popleft()
+            except IndexError:
+                if pending:
+                    self._call(self.flush)
+                    pending = False
+                if self.closing:
+                    break
+                self.waiting = True
+                self.wakeup.clear()
+                if not queue:
+                    self.wakeup.wait(0.5)
+                self.waiting = False
+                continue
+            
+            self._call(self.handle, event)
+            pending = True
+    
+    def _call(self, func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self.errors += 1
+            if self.errors == 1:
+                print(f"Hook {self.name} error: {e} (further errors are counted)")
+    
+    def close(self, timeout: float = 2.0):
+        """Kirim sisa antrian lalu hentikan worker"""
+        self.closing = True
+        self.wakeup.set()
+        self.thread.join(timeout)
+        self.release()
+
+class JsonLinesHook(HookSubscriber):
+    """Tulis setiap event sebagai satu baris JSON"""
+    
+    name = "jsonl"
+    
+    def __init__(self, path: str, events=None):
+        self.file = open(path, 'a')
+        super().__init__(events)
+    
+    def handle(self, event: Dict):
+        self.file.write(json.dumps(event) + "\n")
+    
+    def flush(self):
+        self.file.flush()
+    
+    def release(self):
+        self.file.close()
+
+class WebhookHook(HookSubscriber):
+    """POST setiap event sebagai JSON ke URL"""
+    
+    name = "webhook"
+    DEFAULT_EVENTS = HOOK_ALERT_EVENTS
+    
+    def __init__(self, url: str, events=None):
+        self.url = url
+        self.session = requests.Session()
+        super().__init__(events)
+    
+    def handle(self, event: Dict):
+        self.session.post(self.url, json=event, timeout=REQUEST_TIMEOUT).raise_for_status()
+    
+    def release(self):
+        self.session.close()
+
+class ExecHook(HookSubscriber):
+    """Jalankan command untuk setiap event, JSON event dikirim lewat stdin"""
+    
+    name = "exec"
+    DEFAULT_EVENTS = HOOK_ALERT_EVENTS
+    
+    def __init__(self, command: str, events=None):
+        self.argv = shlex.split(command)
+        super().__init__(events)
+    
+    def handle(self, event: Dict):
+        subprocess.run(self.argv, input=json.dumps(event), text=True,
+                       timeout=HOOK_EXEC_TIMEOUT, check=True)
+
+HOOK_TYPES = {
+    'jsonl': JsonLinesHook,
+    'webhook': WebhookHook,
+    'exec': ExecHook,
+}
+
+class HookBus:
+    """Distribusi event DiceBot ke semua subscriber
+    
+    DiceBot hanya memanggil emit() jika bus terpasang (self.hooks bukan None),
+    sehingga tanpa subscriber tidak ada biaya per bet sama sekali. `kinds`
+    berisi semua event yang diminta subscriber agar event per bet tidak
+    dibangun jika tidak ada yang mendengarkan.
+    """
+    
+    def __init__(self):
+        self.subscribers: List[HookSubscriber] = []
+        self.kinds = frozenset()
+    
+    def subscribe(self, subscriber: HookSubscriber):
+        self.subscribers.append(subscriber)
+        self.kinds = self.kinds | subscriber.events
+    
+    def emit(self, kind: str, data: Dict):
+        """Kirim event ke subscriber yang berlangganan kind"""
+        if kind not in self.kinds:
+            return
+        data['event'] = kind
+        data['time'] = time.time()
+        for subscriber in self.subscribers:
+            if kind in subscriber.events:
+                subscriber.offer(data)
+    
+    def close(self) -> List[str]:
+        """Hentikan semua subscriber, kembalikan ringkasan event yang hilang/gagal"""
+        notes = []
+        for subscriber in self.subscribers:
+            subscriber.close()
+            if subscriber.dropped or subscriber.errors:
+                notes.append(f"{subscriber.name}: {subscriber.dropped} dropped, {subscriber.errors} failed")
+        self.subscribers = []
+        self.kinds = frozenset()
+        return notes
+
+def parse_hook_spec(spec: str) -> Tuple[type, Optional[List[str]], str]:
+    """Pecah spesifikasi TYPE[event,...]:TARGET menjadi (kelas, events, target)"""
+    match = re.match(r'^(\w+)(?:\[([\w,]*)\])?:(.+)$', spec)
+    if not match or match.group(1) not in HOOK_TYPES:
+        raise ValueError(f"Invalid hook spec: {spec}")
+    
+    kind, events, target = match.groups()
+    if events:
+        events = [e for e in events.split(',') if e]
+        unknown = set(events) - set(HOOK_EVENTS)
+        if unknown:
+            raise ValueError(f"Unknown hook events: {', '.join(sorted(unknown))}")
+    return HOOK_TYPES[kind], events or None, target
+
+def build_hook_bus(specs: List[str]) -> Optional[HookBus]:
+    """HookBus dari daftar --hook, None jika tidak ada subscriber"""
+    if not specs:
+        return None
+    bus = HookBus()
+    for spec in specs:
+        hook_class, events, target = parse_hook_spec(spec)
+        bus.subscribe(hook_class(target, events))
+    return bus
 
 # ============== TERMINAL MANAGER ==============
 
@@ -111,6 +810,10 @@ class TerminalManager:
         self.last_width_check = time.time()
         self.width_check_interval = 1.0
         
+        # Cache string jam per detik agar tidak membuat datetime tiap baris log
+        self.clock_second = -1
+        self.clock_text = ""
+        
         # Enable ANSI colors di Windows 10+
         if os.name == 'nt':
             self._enable_windows_colors()
@@ -150,6 +853,14 @@ class TerminalManager:
             self.terminal_width = self.get_terminal_width()
             self.last_width_check = current_time
     
+    def clock(self) -> str:
+        """Timestamp HH:MM:SS saat ini (di-cache per detik)"""
+        now = int(time.time())
+        if now != self.clock_second:
+            self.clock_second = now
+            self.clock_text = time.strftime("%H:%M:%S", time.localtime(now))
+        return self.clock_text
+    
     def center_text(self, text: str, width: int = None) -> str:
         """Center text dengan lebar tertentu"""
         if width is None:
@@ -233,7 +944,9 @@ class TerminalManager:
             f"{self.YELLOW}[6]{self.RESET} View Statistics",
             f"{self.YELLOW}[7]{self.RESET} View Current Settings",
             f"{self.YELLOW}[8]{self.RESET} Clear Screen",
-            f"{self.YELLOW}[9]{self.RESET} Exit"
+            f"{self.YELLOW}[9]{self.RESET} Exit",
+            f"{self.YELLOW}[P]{self.RESET} Profile Betting Thread",
+            f"{self.YELLOW}[B]{self.RESET} Portfolio Balances"
         ]
         
         print(self.create_box("MAIN MENU", "\n".join(menu_items)))
@@ -241,11 +954,11 @@ class TerminalManager:
         if balance_text:
             print(balance_text)
         
-        print(f"\n{self.CYAN}Select option (1-9): {self.RESET}", end="")
+        print(f"\n{self.CYAN}Select option (1-9, P, B): {self.RESET}", end="")
     
     def print_log(self, message: str, icon: str = "📝", color: str = "white"):
         """Menampilkan log message dengan timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self.clock()
         
         color_map = {
             "green": self.GREEN,
@@ -269,7 +982,7 @@ class TerminalManager:
     def print_bet_result(self, result: BetResult, total_profit: float, 
                         consecutive_wins: int, consecutive_losses: int):
         """Menampilkan hasil bet dengan format yang rapi"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self.clock()
         icon = "✅" if result.profit > 0 else "❌"
         profit_color = self.GREEN if result.profit > 0 else self.RED
         profit_sign = "+" if result.profit > 0 else ""
@@ -302,7 +1015,17 @@ class TerminalManager:
                   f"P:{profit_color}{profit_sign}{result.profit:.8f}{self.RESET} "
                   f"B:{result.balance:.8f}")
     
-    def print_stats(self, stats: Dict):
+    def sparkline(self, curve: 'BalanceCurve', width: int = CURVE_WIDTH) -> str:
+        """Sparkline dari nilai terakhir setiap bucket kurva"""
+        values = curve.lasts
+        if len(values) > width:
+            values = [values[(col + 1) * len(values) // width - 1] for col in range(width)]
+        
+        low, high = curve.low(), curve.high()
+        scale = (len(SPARK_CHARS) - 1) / (high - low) if high > low else 0.0
+        return "".join(SPARK_CHARS[int((value - low) * scale)] for value in values)
+    
+    def print_stats(self, stats: Dict, curve: Optional['BalanceCurve'] = None):
         """Menampilkan statistics dalam box"""
         if not stats:
             return
@@ -335,9 +1058,81 @@ class TerminalManager:
         lines.append(f"Bets/Second: {self.BLUE}{bps:.2f}{self.RESET}")
         lines.append(f"Session Time: {self.YELLOW}{session_time:.0f}s{self.RESET}")
         
+        if curve is not None and curve.points >= 2:
+            lines.append("")
+            lines.append(f"Profit Curve ({curve.low():+.8f} .. {curve.high():+.8f})")
+            lines.append(self.sparkline(curve))
+        
         content = "\n".join(lines)
         print(self.create_box("📊 LIVE STATISTICS", content))
     
+    def print_portfolio(self, rows: List[Dict], active_coin: str):
+        """Menampilkan balance semua coin dari cache"""
+        lines = []
+        for row in rows:
+            marker = " ◀" if row['coin'] == active_coin else ""
+            if row['balance'] is None:
+                lines.append(f"{row['coin']:<5} {self.RED}unavailable{self.RESET}{marker}")
+            else:
+                lines.append(
+                    f"{row['coin']:<5} {self.GREEN}{row['balance']:.8f}{self.RESET}  "
+                    f"{row['source']} {row['age']:.0f}s ago{marker}"
+                )
+        
+        print(self.create_box("💰 PORTFOLIO", "\n".join(lines)))
+    
+    def print_windows(self, windows: List[Dict[str, float]]):
+        """Menampilkan P&L bergulir per window waktu"""
+        lines = []
+        for window in windows:
+            profit_color = self.GREEN if window['profit'] >= 0 else self.RED
+            lines.append(
+                f"{window['label']:>3}  {profit_color}{window['profit']:+.8f}{self.RESET}  "
+                f"wag {window['wagered']:.8f}  {window['win_rate']:5.1f}%  "
+                f"{window['bets_per_second']:.2f}/s"
+            )
+        
+        print(self.create_box("🕒 ROLLING WINDOWS", "\n".join(lines)))
+    
+    def print_shadow(self, rows: List[Dict], live_profit: float, lag: int = 0):
+        """Menampilkan P&L shadow preset lain dibanding sesi live"""
+        if not rows:
+            return
+        
+        lines = [f"Live P&L: {self.CYAN}{live_profit:+.8f} BTC{self.RESET}", ""]
+        for row in sorted(rows, key=lambda r: r['profit'], reverse=True):
+            profit_color = self.GREEN if row['profit'] >= 0 else self.RED
+            status = f"stopped: {row['stopped']}" if row['stopped'] else "active"
+            lines.append(
+                f"{row['name'][:22]:<22} {profit_color}{row['profit']:+.8f}{self.RESET} "
+                f"{row['bets']:>6} bets  {status}"
+            )
+        
+        if lag > 0:
+            lines.append("")
+            lines.append(f"{self.YELLOW}Catching up: {lag} rolls pending{self.RESET}")
+        
+        print(self.create_box("👥 SHADOW PRESETS", "\n".join(lines)))
+    
+    def print_fairness(self, report: Dict[str, float], threshold: float):
+        """Menampilkan hasil monitor fairness roll"""
+        def z_text(z: float) -> str:
+            color = self.RED if abs(z) >= threshold else self.GREEN
+            return f"{color}z={z:+.2f}{self.RESET}"
+        
+        lines = [
+            f"Samples: {self.YELLOW}{report['samples']}{self.RESET}",
+            f"Roll Uniformity: {z_text(report['uniformity_z'])}",
+            f"Win Rate: {report['win_rate'] * 100:.2f}% vs {report['expected_win_rate'] * 100:.2f}% {z_text(report['win_rate_z'])}",
+            f"Loss Run Lengths: {z_text(report['run_length_z'])}",
+            f"Serial Correlation: {report['serial_correlation']:+.4f} {z_text(report['serial_z'])}",
+        ]
+        
+        if report['samples'] < FAIRNESS_MIN_SAMPLES:
+            lines.append(f"{self.GRAY}Alerts start after {FAIRNESS_MIN_SAMPLES} rolls{self.RESET}")
+        
+        print(self.create_box("🔎 ROLL FAIRNESS", "\n".join(lines)))
+    
     def print_settings(self, config: BotConfig):
         """Menampilkan settings saat ini"""
         if not config or not config.strategy:
@@ -349,6 +1144,7 @@ class TerminalManager:
         lines.append(f"API Key: {'***' + config.api_key[-4:] if config.api_key else 'Not Set'}")
         lines.append(f"Coin: {self.YELLOW}{config.coin}{self.RESET}")
         lines.append(f"Delay: {config.delay_ms}ms")
+        lines.append(f"Rate Limit: {f'{config.rate_limit:g} bets/s per key' if config.rate_limit > 0 else 'Off'}")
         lines.append("")
         lines.append(f"{self.BOLD}Strategy: {strat.name}{self.RESET}")
         lines.append(f"Type: {strat.strategy_type}")
@@ -359,6 +1155,7 @@ class TerminalManager:
         lines.append(f"Stop Profit: {strat.auto_stop_profit:.8f} BTC")
         lines.append(f"Stop Loss: {strat.auto_stop_loss:.8f} BTC")
         lines.append(f"Max Consecutive Losses: {strat.max_consecutive_losses}")
+        lines.append(f"Stop Window: {strat.stop_window or 'Session'}")
         
         content = "\n".join(lines)
         print(self.create_box("⚙️ CURRENT SETTINGS", content))
@@ -411,10 +1208,408 @@ class TerminalManager:
 
 # ============== BOT ENGINE ==============
 
+class LatencyTracker:
+    """Distribusi latency bergulir dari sampel request terakhir"""
+    
+    def __init__(self, size: int = 256):
+        self.samples = deque(maxlen=size)
+    
+    def add(self, seconds: float):
+        """Tambah satu sampel latency (detik)"""
+        self.samples.append(seconds)
+    
+    def percentiles(self, *points: float) -> Tuple[float, ...]:
+        """Percentile (0-100) dari sampel saat ini, 0.0 jika belum ada sampel"""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(round(point / 100.0 * last)))] for point in points)
+
+class AdaptiveTimeout:
+    """Timeout connect/read satu endpoint dari distribusi latency bergulir
+    
+    Timeout = p99 x TIMEOUT_MULTIPLIER, dibatasi TIMEOUT_FLOOR dan
+    TIMEOUT_CEILING (mulai dari REQUEST_TIMEOUT), dihitung ulang setiap
+    TIMEOUT_REFRESH sampel agar sort percentile tidak terjadi per bet. Request yang timeout dicatat sebagai
+    sampel sebesar waktu tunggunya, sehingga timeout ikut naik saat API melambat.
+    """
+    
+    def __init__(self, tracker: LatencyTracker):
+        self.tracker = tracker
+        self.value = REQUEST_TIMEOUT
+        self.longest = max(REQUEST_TIMEOUT)
+        self.pending = 0
+    
+    def observe(self, seconds: float):
+        """Catat durasi satu request (sukses atau timeout)"""
+        self.tracker.add(seconds)
+        self.pending += 1
+        if self.pending >= TIMEOUT_REFRESH:
+            self.refresh()
+    
+    def refresh(self):
+        """Hitung ulang timeout dari sampel saat ini"""
+        self.pending = 0
+        if len(self.tracker.samples) < TIMEOUT_MIN_SAMPLES:
+            self.value = REQUEST_TIMEOUT
+        else:
+            base = self.tracker.percentiles(99)[0] * TIMEOUT_MULTIPLIER
+            self.value = tuple(
+                min(max(base, floor), ceiling)
+                for floor, ceiling in zip(TIMEOUT_FLOOR, TIMEOUT_CEILING)
+            )
+        self.longest = max(self.value)
+    
+    def get(self, deadline: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """(connect, read) untuk request berikutnya, dipotong ke sisa waktu deadline
+        
+        deadline adalah waktu time.monotonic(); None jika deadline sudah lewat.
+        """
+        if deadline is None:
+            return self.value
+        remaining = deadline - time.monotonic()
+        if remaining >= self.longest:
+            return self.value
+        if remaining <= 0:
+            return None
+        connect, read = self.value
+        return min(connect, remaining), min(read, remaining)
+
+class RollingWindow:
+    """Agregat P&L bergulir dalam ring bucket waktu
+    
+    Window `span` detik dibagi `buckets` bucket yang masing-masing mencatat
+    epoch-nya. add() membersihkan bucket yang sudah keluar window lalu
+    menambah total berjalan, sehingga biaya per bet O(1) (amortized: tiap
+    bucket dibersihkan paling banyak sekali per putaran ring).
+    """
+    
+    def __init__(self, label: str, span: float, buckets: int):
+        self.label = label
+        self.span = float(span)
+        self.buckets = buckets
+        self.width = self.span / buckets
+        
+        self.epochs = [-1] * buckets
+        self.profits = [0.0] * buckets
+        self.wagers = [0.0] * buckets
+        self.wins = [0] * buckets
+        self.bets = [0] * buckets
+        
+        self.head = -1  # epoch bucket terbaru
+        self.first = None  # timestamp bet pertama yang pernah masuk
+        self.last = 0.0  # timestamp terbaru
+        self.profit = 0.0
+        self.wagered = 0.0
+    
+    def _advance(self, epoch: int):
+        """Geser head ke epoch, keluarkan bucket yang kedaluwarsa dari total"""
+        if epoch - self.head >= self.buckets:
+            for i in range(self.buckets):
+                self.epochs[i] = -1
+                self.profits[i] = self.wagers[i] = 0.0
+                self.wins[i] = self.bets[i] = 0
+            self.profit = self.wagered = 0.0
+        else:
+            for e in range(self.head + 1, epoch + 1):
+                i = e % self.buckets
+                if self.epochs[i] >= 0:
+                    self.profit -= self.profits[i]
+                    self.wagered -= self.wagers[i]
+                    self.epochs[i] = -1
+                    self.profits[i] = self.wagers[i] = 0.0
+                    self.wins[i] = self.bets[i] = 0
+                if i == 0:
+                    # Sekali per putaran: hitung ulang total agar error float tidak menumpuk
+                    self.profit = sum(self.profits)
+                    self.wagered = sum(self.wagers)
+        self.head = epoch
+    
+    def add(self, timestamp: float, profit: float, wagered: float, won: bool):
+        """Catat satu bet pada waktu timestamp (detik)"""
+        epoch = int(timestamp // self.width)
+        if epoch > self.head:
+            self._advance(epoch)
+        elif epoch <= self.head - self.buckets:
+            return  # lebih tua dari window
+        
+        if self.first is None:
+            self.first = timestamp
+        if timestamp > self.last:
+            self.last = timestamp
+        
+        i = epoch % self.buckets
+        self.epochs[i] = epoch
+        self.profits[i] += profit
+        self.wagers[i] += wagered
+        self.bets[i] += 1
+        if won:
+            self.wins[i] += 1
+        self.profit += profit
+        self.wagered += wagered
+    
+    def profit_at(self, now: float) -> float:
+        """Profit window yang berakhir pada now, bucket kedaluwarsa dikeluarkan dulu
+        
+        Dipanggil dari thread loop (sama dengan add()), O(1) amortized.
+        """
+        epoch = int(now // self.width)
+        if epoch > self.head:
+            self._advance(epoch)
+        return self.profit
+    
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Profit, wagered, win rate dan bets/detik dalam window pada waktu now
+        
+        Tidak mengubah ring (aman dipanggil dari thread UI); default now adalah
+        waktu bet terakhir yang masuk.
+        """
+        if now is None:
+            now = self.last
+        oldest = int(now // self.width) - self.buckets
+        
+        profit = wagered = 0.0
+        wins = bets = 0
+        for i in range(self.buckets):
+            if self.epochs[i] > oldest:
+                profit += self.profits[i]
+                wagered += self.wagers[i]
+                wins += self.wins[i]
+                bets += self.bets[i]
+        
+        elapsed = min(self.span, now - self.first) if self.first is not None else 0.0
+        return {
+            'label': self.label,
+            'profit': profit,
+            'wagered': wagered,
+            'bets': bets,
+            'win_rate': (wins / bets * 100) if bets > 0 else 0.0,
+            'bets_per_second': bets / max(elapsed, self.width) if bets > 0 else 0.0
+        }
+
+class BalanceCurve:
+    """Kurva profit sesi dalam memori tetap (bucketing min/max online)
+    
+    Setiap bucket mewakili `span` bet berturut-turut dan menyimpan nilai min,
+    max dan terakhir. Saat semua bucket terisi, pasangan bucket bertetangga
+    digabung dan span digandakan, sehingga memori tetap O(buckets) untuk sesi
+    sepanjang apa pun dan biaya per bet O(1) amortized.
+    """
+    
+    def __init__(self, buckets: int = CURVE_BUCKETS):
+        self.size = buckets
+        self.reset()
+    
+    def reset(self):
+        self.span = 1
+        self.filled = 0  # titik di bucket terakhir
+        self.points = 0
+        self.lows: List[float] = []
+        self.highs: List[float] = []
+        self.lasts: List[float] = []
+    
+    def add(self, value: float):
+        """Tambah satu titik kurva"""
+        if self.filled == 0:
+            if len(self.lasts) == self.size:
+                self._merge()
+            self.lows.append(value)
+            self.highs.append(value)
+            self.lasts.append(value)
+        else:
+            if value < self.lows[-1]:
+                self.lows[-1] = value
+            elif value > self.highs[-1]:
+                self.highs[-1] = value
+            self.lasts[-1] = value
+        
+        self.filled += 1
+        if self.filled == self.span:
+            self.filled = 0
+        self.points += 1
+    
+    def _merge(self):
+        """Gabungkan bucket berpasangan, span menjadi dua kali lipat"""
+        lows, highs = self.lows, self.highs
+        self.lows = [min(lows[i], lows[i + 1]) for i in range(0, self.size, 2)]
+        self.highs = [max(highs[i], highs[i + 1]) for i in range(0, self.size, 2)]
+        self.lasts = self.lasts[1::2]
+        self.span *= 2
+    
+    def low(self) -> float:
+        return min(self.lows) if self.lows else 0.0
+    
+    def high(self) -> float:
+        return max(self.highs) if self.highs else 0.0
+
+class RollingStats:
+    """Kumpulan RollingWindow (1m, 1h, 24h) yang diupdate dari setiap bet"""
+    
+    def __init__(self, windows=ROLLING_WINDOWS):
+        self.windows = {label: RollingWindow(label, span, buckets) for label, span, buckets in windows}
+        self._all = tuple(self.windows.values())
+    
+    def __getitem__(self, label: str) -> RollingWindow:
+        return self.windows[label]
+    
+    def add(self, timestamp: float, profit: float, wagered: float, won: bool):
+        """Catat satu bet ke semua window"""
+        for window in self._all:
+            window.add(timestamp, profit, wagered, won)
+    
+    def snapshots(self, now: Optional[float] = None) -> List[Dict[str, float]]:
+        """Snapshot semua window, urut dari yang terpendek"""
+        return [window.snapshot(now) for window in self._all]
+
+class SharedRateLimiter:
+    """Token bucket per API key yang dibagi antar proses lewat file mmap
+    
+    State bucket (token, waktu refill terakhir) ada di file kecil di temp dir
+    yang di-mmap oleh setiap proses dengan API key yang sama. Update dilindungi
+    flock singkat di sekitar satu read-modify-write, sehingga biaya acquire
+    hanya beberapa mikrodetik. Waktu memakai time.monotonic() yang berlaku
+    untuk semua proses di host yang sama.
+    """
+    
+    LAYOUT = struct.Struct("<dd")
+    DIRECTORY = os.path.join(tempfile.gettempdir(), "cgbot-ratelimit")
+    
+    _instances: Dict[Tuple[str, float], 'SharedRateLimiter'] = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, api_key: str, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.local_lock = threading.Lock()
+        
+        os.makedirs(self.DIRECTORY, exist_ok=True)
+        name = hashlib.sha256(api_key.encode()).hexdigest()[:16] + ".bucket"
+        self.path = os.path.join(self.DIRECTORY, name)
+        
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self.fd).st_size < self.LAYOUT.size:
+            os.ftruncate(self.fd, self.LAYOUT.size)
+        self.map = mmap.mmap(self.fd, self.LAYOUT.size)
+    
+    @classmethod
+    def get(cls, api_key: str, rate: float) -> 'SharedRateLimiter':
+        """Limiter bersama untuk API key dan rate tertentu (satu per proses)"""
+        key = (api_key, rate)
+        limiter = cls._instances.get(key)
+        if limiter is None:
+            with cls._instances_lock:
+                limiter = cls._instances.get(key)
+                if limiter is None:
+                    limiter = cls._instances[key] = cls(api_key, rate)
+        return limiter
+    
+    def try_acquire(self) -> float:
+        """Ambil satu token: 0.0 jika berhasil, selain itu detik sampai token tersedia"""
+        return self._update(True)
+    
+    def peek(self) -> float:
+        """Detik sampai token tersedia (0.0 jika ada), tanpa mengambil token"""
+        return self._update(False)
+    
+    def _update(self, take: bool) -> float:
+        """Refill bucket dan ambil satu token jika take dan tersedia"""
+        with self.local_lock:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                tokens, last = self.LAYOUT.unpack_from(self.map, 0)
+                now = time.monotonic()
+                
+                # File baru atau dari boot sebelumnya: mulai dengan bucket penuh
+                if last <= 0.0 or last > now:
+                    tokens, last = self.burst, now
+                
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1.0:
+                    if take:
+                        tokens -= 1.0
+                    wait = 0.0
+                else:
+                    wait = (1.0 - tokens) / self.rate
+                
+                self.LAYOUT.pack_into(self.map, 0, tokens, now)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return wait
+    
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Tunggu (blocking) sampai token tersedia
+        
+        Dengan deadline (time.monotonic()), tunggu tidak melewati deadline:
+        jika token baru tersedia setelahnya, kembalikan False tanpa mengambil token.
+        """
+        wait = self.try_acquire()
+        while wait > 0.0:
+            if deadline is not None and time.monotonic() + wait >= deadline:
+                return False
+            time.sleep(wait)
+            wait = self.try_acquire()
+        return True
+    
+    async def acquire_async(self, deadline: Optional[float] = None) -> bool:
+        """Tunggu (non-blocking) sampai token tersedia (lihat acquire)"""
+        wait = self.try_acquire()
+        while wait > 0.0:
+            if deadline is not None and time.monotonic() + wait >= deadline:
+                return False
+            await asyncio.sleep(wait)
+            wait = self.try_acquire()
+        return True
+
+class BalanceCache:
+    """Balance per coin dengan TTL
+    
+    Diisi dari request balance dan dari BetResult.balance setiap bet, sehingga
+    coin yang sedang dimainkan tetap segar tanpa request tambahan.
+    """
+    
+    def __init__(self, ttl: float = BALANCE_TTL):
+        self.ttl = ttl
+        self.entries: Dict[str, Tuple[float, float, str]] = {}  # coin -> (balance, monotonic, sumber)
+    
+    def put(self, coin: str, balance: float, source: str = "api"):
+        """Simpan balance coin saat ini"""
+        self.entries[coin] = (balance, time.monotonic(), source)
+    
+    def get(self, coin: str) -> Optional[float]:
+        """Balance coin jika masih dalam TTL, None jika tidak ada/basi"""
+        entry = self.entries.get(coin)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+    
+    def stale(self, coins) -> List[str]:
+        """Coin yang perlu diambil ulang dari API"""
+        return [coin for coin in coins if self.get(coin) is None]
+    
+    def rows(self, coins) -> List[Dict]:
+        """Isi cache untuk ditampilkan (balance None jika belum pernah didapat)"""
+        now = time.monotonic()
+        rows = []
+        for coin in coins:
+            entry = self.entries.get(coin)
+            if entry is None:
+                rows.append({'coin': coin, 'balance': None, 'age': 0.0, 'source': ''})
+            else:
+                rows.append({'coin': coin, 'balance': entry[0], 'age': now - entry[1], 'source': entry[2]})
+        return rows
+    
+    def clear(self):
+        self.entries.clear()
+
 class CryptoGamesAPI:
     """Client untuk API Crypto.Games"""
     
     def __init__(self):
+        self.latency = {'balance': LatencyTracker(), 'placebet': LatencyTracker()}
+        self.timeouts = {name: AdaptiveTimeout(tracker) for name, tracker in self.latency.items()}
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -425,7 +1620,13 @@ class CryptoGamesAPI:
         """Mendapatkan balance dari API"""
         try:
             url = f"{API_BASE_URL}/balance/{coin}/{api_key}"
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeouts['balance'].get())
+            except requests.exceptions.Timeout:
+                self.timeouts['balance'].observe(time.perf_counter() - started)
+                raise
+            self.timeouts['balance'].observe(time.perf_counter() - started)
             
             if response.status_code == 200:
                 data = response.json()
@@ -434,37 +1635,551 @@ class CryptoGamesAPI:
             print(f"Error getting balance: {e}")
         return None
     
-    def place_bet(self, coin: str, api_key: str, bet_data: Dict) -> Optional[BetResult]:
-        """Menempatkan taruhan"""
+    def get_balances(self, coins: List[str], api_key: str) -> Dict[str, Optional[float]]:
+        """Balance beberapa coin sekaligus, request paralel lewat pool koneksi session"""
+        if not coins:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(coins)) as pool:
+            return dict(zip(coins, pool.map(lambda coin: self.get_balance(coin, api_key), coins)))
+    
+    def place_bet(self, coin: str, api_key: str, bet_data: Dict,
+                  deadline: Optional[float] = None, rate_limit: float = 0.0) -> Optional[BetResult]:
+        """Menempatkan taruhan
+        
+        deadline: batas time.monotonic() untuk bet ini. rate_limit: bet/detik
+        per API key yang dibagi antar proses (dari config sesi), 0 = nonaktif.
+        Tunggu token rate limit ikut dibatasi deadline; token hanya diambil
+        jika request benar-benar dikirim.
+        """
         try:
+            timeout = self.timeouts['placebet'].get(deadline)
+            if timeout is None:
+                return None
+            
+            if rate_limit > 0:
+                if not SharedRateLimiter.get(api_key, rate_limit).acquire(deadline):
+                    return None
+                timeout = self.timeouts['placebet'].get(deadline)
+                if timeout is None:
+                    return None
+            
             url = f"{API_BASE_URL}/placebet/{coin}/{api_key}"
-            response = self.session.post(url, json=bet_data, timeout=REQUEST_TIMEOUT)
+            started = time.perf_counter()
+            try:
+                response = self.session.post(url, json=bet_data, timeout=timeout)
+            except requests.exceptions.Timeout:
+                self.timeouts['placebet'].observe(time.perf_counter() - started)
+                raise
+            self.timeouts['placebet'].observe(time.perf_counter() - started)
             
             if response.status_code == 200:
-                data = response.json()
-                return BetResult(
-                    bet_id=data.get('BetId', 0),
-                    roll=data.get('Roll', 0),
-                    profit=float(data.get('Profit', 0)),
-                    balance=float(data.get('Balance', 0)),
-                    success=True,
-                    timestamp=time.time()
-                )
+                return self.parse_bet(response.json())
         except Exception as e:
             print(f"Error placing bet: {e}")
         return None
+    
+    @staticmethod
+    def parse_bet(data: Dict) -> BetResult:
+        """Ubah response placebet menjadi BetResult"""
+        return BetResult(
+            bet_id=data.get('BetId', 0),
+            roll=data.get('Roll', 0),
+            profit=float(data.get('Profit', 0)),
+            balance=float(data.get('Balance', 0)),
+            success=True,
+            timestamp=time.time()
+        )
 
-class DiceBot:
-    """Mesin utama bot dice dengan 10 preset strategi"""
+class AsyncEngine:
+    """Event loop bersama untuk menjalankan banyak sesi DiceBot sebagai coroutine
     
-    # ============== PRESET STRATEGIES ==============
-    PRESET_STRATEGIES = {
-        1: Strategy(
-            name="💰 FAUCET FARMING",
-            bet_amount=MIN_BET,
-            chance=49.5,
-            payout=2.0,
-            under_over=True,
+    Satu thread, satu event loop dan satu connection pool aiohttp dipakai
+    bersama oleh semua sesi, menggantikan satu thread + pool per bot.
+    """
+    
+    def __init__(self, connection_limit: int = 100):
+        if aiohttp is None:
+            raise RuntimeError("Async engine requires aiohttp (pip install aiohttp)")
+        
+        self.connection_limit = connection_limit
+        self.session = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        """Jalankan event loop di thread engine"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def in_engine_thread(self) -> bool:
+        """Apakah pemanggil berjalan di thread event loop"""
+        return threading.current_thread() is self.thread
+    
+    def submit(self, coro) -> 'concurrent.futures.Future':
+        """Jadwalkan coroutine di event loop engine (thread-safe)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """Jalankan coroutine dan tunggu hasilnya dari thread lain"""
+        return self.submit(coro).result(timeout)
+    
+    def get_session(self) -> 'aiohttp.ClientSession':
+        """ClientSession bersama, dibuat pertama kali di dalam event loop"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                    'Accept': 'application/json'
+                }
+            )
+        return self.session
+    
+    async def _close_session(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    def close(self):
+        """Tutup connection pool dan hentikan event loop"""
+        if not self.loop.is_running():
+            return
+        try:
+            self.run(self._close_session(), timeout=5.0)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5.0)
+
+class AsyncCryptoGamesAPI:
+    """Client non-blocking untuk API Crypto.Games di atas AsyncEngine"""
+    
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.latency = {'balance': LatencyTracker(), 'placebet': LatencyTracker()}
+        self.timeouts = {name: AdaptiveTimeout(tracker) for name, tracker in self.latency.items()}
+    
+    @staticmethod
+    def client_timeout(timeout: Tuple[float, float], deadline: Optional[float] = None) -> 'aiohttp.ClientTimeout':
+        """ClientTimeout dari (connect, read), total dibatasi sisa deadline"""
+        total = deadline - time.monotonic() if deadline is not None else None
+        return aiohttp.ClientTimeout(total=total, sock_connect=timeout[0], sock_read=timeout[1])
+    
+    async def get_balance(self, coin: str, api_key: str) -> Optional[float]:
+        """Mendapatkan balance dari API"""
+        try:
+            url = f"{API_BASE_URL}/balance/{coin}/{api_key}"
+            started = time.perf_counter()
+            timeout = self.client_timeout(self.timeouts['balance'].get())
+            try:
+                async with self.engine.get_session().get(url, timeout=timeout) as response:
+                    self.timeouts['balance'].observe(time.perf_counter() - started)
+                    if response.status == 200:
+                        data = await response.json(content_type=None)
+                        return float(data['Balance'])
+            except asyncio.TimeoutError:
+                self.timeouts['balance'].observe(time.perf_counter() - started)
+                raise
+        except Exception as e:
+            print(f"Error getting balance: {e}")
+        return None
+    
+    async def get_balances(self, coins: List[str], api_key: str) -> Dict[str, Optional[float]]:
+        """Balance beberapa coin sekaligus lewat ClientSession bersama"""
+        balances = await asyncio.gather(*(self.get_balance(coin, api_key) for coin in coins))
+        return dict(zip(coins, balances))
+    
+    async def place_bet(self, coin: str, api_key: str, bet_data: Dict,
+                        deadline: Optional[float] = None, rate_limit: float = 0.0) -> Optional[BetResult]:
+        """Menempatkan taruhan (lihat CryptoGamesAPI.place_bet)"""
+        try:
+            timeout = self.timeouts['placebet'].get(deadline)
+            if timeout is None:
+                return None
+            
+            if rate_limit > 0:
+                if not await SharedRateLimiter.get(api_key, rate_limit).acquire_async(deadline):
+                    return None
+                timeout = self.timeouts['placebet'].get(deadline)
+                if timeout is None:
+                    return None
+            
+            url = f"{API_BASE_URL}/placebet/{coin}/{api_key}"
+            started = time.perf_counter()
+            timeout = self.client_timeout(timeout, deadline)
+            try:
+                async with self.engine.get_session().post(url, json=bet_data, timeout=timeout) as response:
+                    self.timeouts['placebet'].observe(time.perf_counter() - started)
+                    if response.status == 200:
+                        return CryptoGamesAPI.parse_bet(await response.json(content_type=None))
+            except asyncio.TimeoutError:
+                self.timeouts['placebet'].observe(time.perf_counter() - started)
+                raise
+        except Exception as e:
+            print(f"Error placing bet: {e}")
+        return None
+
+def roll_wins(roll: float, chance: float, under: bool) -> bool:
+    """Apakah roll menang untuk win chance dan arah tertentu"""
+    if under:
+        return roll < chance
+    return roll > 100.0 - chance
+
+def bet_profit(bet: float, payout: float, won: bool) -> float:
+    """Profit simulasi dari satu bet (dibulatkan ke satoshi)"""
+    if won:
+        return round(bet * (payout - 1.0), 8)
+    return -bet
+
+class ReplayAPI:
+    """Backend replay: memutar ulang stream roll rekaman tanpa network
+    
+    Hasil tiap bet dihitung ulang dari roll, payout dan chance strategi yang
+    sedang aktif, sehingga stream yang sama bisa diuji dengan preset lain.
+    """
+    
+    def __init__(self, rolls: List[float], balance: float,
+                 chance_source: Callable[[], float]):
+        self.rolls = rolls
+        self.index = 0
+        self.balance = balance
+        self.chance_source = chance_source
+        self.on_exhausted = None
+    
+    @staticmethod
+    def load_records(path: str) -> List[Dict]:
+        """Baca rekaman bet (JSON lines, satu bet per baris)"""
+        records = []
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+        return records
+    
+    def get_balance(self, coin: str, api_key: str) -> Optional[float]:
+        """Balance simulasi saat ini"""
+        return self.balance
+    
+    def place_bet(self, coin: str, api_key: str, bet_data: Dict,
+                  deadline: Optional[float] = None, rate_limit: float = 0.0) -> Optional[BetResult]:
+        """Mainkan roll berikutnya dari rekaman"""
+        index = self.index
+        if index >= len(self.rolls):
+            if self.on_exhausted is not None:
+                self.on_exhausted()
+            return None
+        self.index = index + 1
+        
+        roll = self.rolls[index]
+        won = roll_wins(roll, self.chance_source(), bet_data['UnderOver'])
+        profit = bet_profit(bet_data['Bet'], bet_data['Payout'], won)
+        self.balance = round(self.balance + profit, 8)
+        
+        return BetResult(
+            bet_id=index + 1,
+            roll=roll,
+            profit=profit,
+            balance=self.balance,
+            success=True,
+            timestamp=float(index)
+        )
+
+class ShadowEvaluator:
+    """Evaluasi shadow preset lain atas stream roll live
+    
+    Loop live hanya menambahkan roll ke deque (O(1), tanpa lock). Worker
+    thread mengosongkan deque per batch dan menjalankan ladder serta aturan
+    stop semua preset shadow sekaligus, jadi jika tertinggal ia otomatis
+    mengejar dalam satu batch besar.
+    """
+    
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, strategies: List[Strategy], initial_balance: float):
+        self.compiled = [CompiledStrategy.compile(strategy) for strategy in strategies]
+        count = len(self.compiled)
+        
+        # State per preset disimpan sebagai array paralel
+        self.initial_balance = initial_balance
+        self.balance = [initial_balance] * count
+        self.profit = [0.0] * count
+        self.wins = [0] * count
+        self.bets = [0] * count
+        self.consecutive_wins = [0] * count
+        self.consecutive_losses = [0] * count
+        self.stopped: List[Optional[str]] = [None] * count
+        
+        self.pending = deque()
+        self.processed = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+    
+    def feed(self, roll: float):
+        """Tambahkan roll live (dipanggil dari loop taruhan)"""
+        self.pending.append(roll)
+    
+    @property
+    def lag(self) -> int:
+        """Jumlah roll yang belum dievaluasi"""
+        return len(self.pending)
+    
+    def close(self):
+        """Hentikan worker setelah sisa roll diproses"""
+        self.stop_event.set()
+        self.thread.join(timeout=2.0)
+    
+    def _worker(self):
+        """Kosongkan antrean roll per batch"""
+        pending = self.pending
+        while True:
+            stopping = self.stop_event.wait(self.POLL_INTERVAL)
+            count = len(pending)
+            if count:
+                self.update([pending.popleft() for _ in range(count)])
+            if stopping:
+                break
+    
+    def update(self, rolls: List[float]):
+        """Jalankan batch roll melalui semua preset shadow"""
+        initial = self.initial_balance
+        balance = self.balance
+        profit = self.profit
+        wins = self.wins
+        bets = self.bets
+        cw = self.consecutive_wins
+        cl = self.consecutive_losses
+        stopped = self.stopped
+        
+        for i, compiled in enumerate(self.compiled):
+            if stopped[i] is not None:
+                continue
+            
+            strat = compiled.strategy
+            chance = strat.chance
+            under = strat.under_over
+            payout = strat.payout
+            daily_goal = initial * 0.10 if compiled.daily_target and initial > 0 else None
+            b, p, w, n, win_streak, loss_streak = balance[i], profit[i], wins[i], bets[i], cw[i], cl[i]
+            reason = None
+            
+            for roll in rolls:
+                reason = compiled.stop_reason(p, initial - b, loss_streak)
+                if reason is None and daily_goal is not None and b - initial >= daily_goal:
+                    reason = 'daily'
+                if reason is None and b < MIN_BET:
+                    reason = 'bust'
+                if reason is not None:
+                    break
+                
+                bet = round(compiled.next_bet(b, win_streak, loss_streak), 8)
+                delta = bet_profit(bet, payout, roll_wins(roll, chance, under))
+                b = round(b + delta, 8)
+                p += delta
+                n += 1
+                
+                if delta > 0:
+                    w += 1
+                    win_streak += 1
+                    loss_streak = 0
+                else:
+                    loss_streak += 1
+                    win_streak = 0
+            
+            balance[i], profit[i], wins[i], bets[i], cw[i], cl[i] = b, p, w, n, win_streak, loss_streak
+            stopped[i] = reason
+        
+        self.processed += len(rolls)
+    
+    def rows(self) -> List[Dict]:
+        """Ringkasan per preset untuk tampilan stats"""
+        return [
+            {
+                'name': compiled.strategy.name,
+                'profit': self.profit[i],
+                'balance': self.balance[i],
+                'bets': self.bets[i],
+                'wins': self.wins[i],
+                'stopped': self.stopped[i]
+            }
+            for i, compiled in enumerate(self.compiled)
+        ]
+
+def chi_square_z(chi2: float, df: int) -> float:
+    """Ubah statistik chi-square menjadi z-score (aproksimasi Wilson-Hilferty)"""
+    if df <= 0:
+        return 0.0
+    scale = 2.0 / (9.0 * df)
+    return ((chi2 / df) ** (1.0 / 3.0) - (1.0 - scale)) / math.sqrt(scale)
+
+class RollFairnessMonitor:
+    """Monitor fairness stream roll secara inkremental
+    
+    Setiap bet hanya memperbarui counter (O(1), memori tetap):
+    - bin uniformitas roll, dengan jumlah kuadrat dijaga inkremental untuk chi-square
+    - jumlah win vs ekspektasi dari Strategy.chance (mendukung swap strategi)
+    - histogram panjang run kalah vs distribusi geometrik
+    - jumlah-jumlah untuk korelasi serial lag-1 antar roll
+    Uji statistik dihitung setiap FAIRNESS_CHECK_INTERVAL bet.
+    """
+    
+    def __init__(self, bins: int = FAIRNESS_BINS, run_bins: int = FAIRNESS_RUN_BINS,
+                 threshold: float = FAIRNESS_Z_THRESHOLD):
+        self.bins = bins
+        self.threshold = threshold
+        
+        self.n = 0
+        self.counts = [0] * bins
+        self.sum_sq = 0
+        
+        self.wins = 0
+        self.expected_wins = 0.0
+        self.win_variance = 0.0
+        
+        self.run_counts = [0] * run_bins
+        self.loss_run = 0
+        
+        self.prev_roll = None
+        self.pairs = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_yy = 0.0
+        self.sum_xy = 0.0
+        
+        self.alerting = set()
+    
+    def add(self, roll: float, chance: float, won: bool) -> List[str]:
+        """Masukkan satu roll, kembalikan alert baru (hanya pada interval pengecekan)"""
+        self.n += 1
+        
+        index = int(roll * self.bins / 100.0)
+        if index >= self.bins:
+            index = self.bins - 1
+        elif index < 0:
+            index = 0
+        count = self.counts[index]
+        self.sum_sq += 2 * count + 1
+        self.counts[index] = count + 1
+        
+        p = chance / 100.0
+        self.expected_wins += p
+        self.win_variance += p * (1.0 - p)
+        if won:
+            self.wins += 1
+            if self.loss_run:
+                bucket = min(self.loss_run, len(self.run_counts)) - 1
+                self.run_counts[bucket] += 1
+                self.loss_run = 0
+        else:
+            self.loss_run += 1
+        
+        prev = self.prev_roll
+        if prev is not None:
+            self.pairs += 1
+            self.sum_x += prev
+            self.sum_y += roll
+            self.sum_xx += prev * prev
+            self.sum_yy += roll * roll
+            self.sum_xy += prev * roll
+        self.prev_roll = roll
+        
+        if self.n >= FAIRNESS_MIN_SAMPLES and self.n % FAIRNESS_CHECK_INTERVAL == 0:
+            return self.check()
+        return []
+    
+    def uniformity_z(self) -> float:
+        """z-score chi-square uniformitas roll"""
+        if not self.n:
+            return 0.0
+        chi2 = self.bins * self.sum_sq / self.n - self.n
+        return chi_square_z(chi2, self.bins - 1)
+    
+    def win_rate_z(self) -> float:
+        """z-score jumlah win terhadap ekspektasi"""
+        if self.win_variance <= 0:
+            return 0.0
+        return (self.wins - self.expected_wins) / math.sqrt(self.win_variance)
+    
+    def run_length_z(self) -> float:
+        """z-score chi-square panjang run kalah terhadap distribusi geometrik"""
+        runs = sum(self.run_counts)
+        if not runs or not self.n:
+            return 0.0
+        
+        p = self.expected_wins / self.n
+        q = 1.0 - p
+        chi2 = 0.0
+        df = 0
+        last = len(self.run_counts) - 1
+        for k, observed in enumerate(self.run_counts):
+            # P(L = k+1) = q^k * p, bin terakhir menampung ekor P(L >= k+1) = q^k
+            probability = q ** k if k == last else q ** k * p
+            expected = runs * probability
+            if expected >= 5.0:
+                chi2 += (observed - expected) ** 2 / expected
+                df += 1
+        return chi_square_z(chi2, df - 1)
+    
+    def serial_correlation(self) -> float:
+        """Korelasi Pearson lag-1 antar roll berurutan"""
+        m = self.pairs
+        if m < 2:
+            return 0.0
+        cov = m * self.sum_xy - self.sum_x * self.sum_y
+        var_x = m * self.sum_xx - self.sum_x * self.sum_x
+        var_y = m * self.sum_yy - self.sum_y * self.sum_y
+        if var_x <= 0 or var_y <= 0:
+            return 0.0
+        return cov / math.sqrt(var_x * var_y)
+    
+    def report(self) -> Dict[str, float]:
+        """Semua statistik saat ini"""
+        correlation = self.serial_correlation()
+        return {
+            'samples': self.n,
+            'uniformity_z': self.uniformity_z(),
+            'win_rate': self.wins / self.n if self.n else 0.0,
+            'expected_win_rate': self.expected_wins / self.n if self.n else 0.0,
+            'win_rate_z': self.win_rate_z(),
+            'run_length_z': self.run_length_z(),
+            'serial_correlation': correlation,
+            'serial_z': correlation * math.sqrt(self.pairs),
+        }
+    
+    def check(self) -> List[str]:
+        """Uji semua statistik, kembalikan alert yang baru melewati threshold"""
+        report = self.report()
+        tests = {
+            'uniformity': report['uniformity_z'],
+            'win rate': report['win_rate_z'],
+            'run length': report['run_length_z'],
+            'serial correlation': report['serial_z'],
+        }
+        
+        # Hysteresis: alert dibersihkan hanya jika z turun di bawah setengah threshold
+        alerts = []
+        for name, z in tests.items():
+            if abs(z) >= self.threshold:
+                if name not in self.alerting:
+                    self.alerting.add(name)
+                    alerts.append(f"{name} deviates (z={z:+.1f}, n={self.n})")
+            elif abs(z) < self.threshold / 2:
+                self.alerting.discard(name)
+        return alerts
+
+class DiceBot:
+    """Mesin utama bot dice dengan 10 preset strategi"""
+    
+    # ============== PRESET STRATEGIES ==============
+    PRESET_STRATEGIES = {
+        1: Strategy(
+            name="💰 FAUCET FARMING",
+            bet_amount=MIN_BET,
+            chance=49.5,
+            payout=2.0,
+            under_over=True,
             auto_stop_profit=0.00000100,
             auto_stop_loss=0.00000025,
             max_consecutive_losses=5,
@@ -622,13 +2337,19 @@ class DiceBot:
         )
     }
     
-    def __init__(self, ui: TerminalManager):
+    def __init__(self, ui: TerminalManager, engine: Optional[AsyncEngine] = None,
+                 load_saved: bool = True):
         self.ui = ui
         self.api = CryptoGamesAPI()
         self.running = False
         self.stop_event = threading.Event()
         self.thread = None
         
+        # Engine async opsional: loop berjalan sebagai coroutine di event loop bersama
+        self.engine = engine
+        self.async_api = AsyncCryptoGamesAPI(engine) if engine is not None else None
+        self.future = None
+        
         # Configuration
         self.config = BotConfig()
         
@@ -656,37 +2377,99 @@ class DiceBot:
         self.bet_times = deque(maxlen=100)
         self.initial_balance = 0.0
         self.daily_target = 0.0
-        self.daily_start_balance = 0.0
+        
+        # Segment shared memory untuk publikasi stats (mode proses terpisah)
+        self.stats_segment = None
+        
+        # Hook loop: sleep dan now (jam window bergulir) bisa diganti (replay),
+        # quiet mematikan output per bet, recorder menyimpan stream roll
+        # sebagai JSON lines untuk replay
+        self.sleep = time.sleep
+        self.now = time.time
+        self.quiet = False
+        self.recorder = None
+        
+        # Evaluasi shadow preset lain (aktif jika shadow_enabled)
+        self.shadow_enabled = False
+        self.shadow = None
+        
+        # Strategi compiled dan swap yang menunggu batas bet berikutnya
+        # (deque: append/popleft atomik, tidak ada swap yang tertimpa)
+        self._compiled = None
+        self.pending_swaps = deque()
+        
+        # Batas risiko portfolio bersama (diisi oleh SessionOrchestrator)
+        self.risk = None
+        
+        # File status mmap untuk 'cgbot top' (lihat enable_status)
+        self.status = None
+        
+        # Profiler sampling on-demand untuk thread loop taruhan
+        self.profiler = None
+        
+        # Monitor fairness stream roll (None = nonaktif)
+        self.fairness = None
+        
+        # P&L bergulir 1m/1h/24h, berlanjut lintas sesi (waktu nyata)
+        self.rolling = RollingStats()
+        
+        # Balance per coin (TTL), coin aktif diupdate dari setiap hasil bet
+        self.balances = BalanceCache()
+        
+        # Bus event untuk hook eksternal (None = tanpa subscriber, tanpa biaya)
+        self.hooks = None
+        
+        # Kurva profit sepanjang sesi dalam memori tetap
+        self.curve = BalanceCurve()
         
         # Load config jika ada
-        self.load_config()
+        if load_saved:
+            self.load_config()
     
     def load_config(self):
         """Load konfigurasi dari file"""
         try:
             if os.path.exists(SAVE_FILE):
                 with open(SAVE_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.config.api_key = data.get('api_key', '')
-                    self.config.coin = data.get('coin', 'BTC')
-                    self.config.delay_ms = data.get('delay_ms', 300)
-                    
-                    strat_data = data.get('strategy', {})
-                    self.config.strategy = Strategy(**strat_data)
+                    self.apply_config_dict(json.load(f))
                     
                 self.ui.print_log("Configuration loaded from file", "📂", "green")
         except Exception as e:
             self.ui.print_log(f"Error loading config: {e}", "❌", "red")
     
-    def save_config(self):
+    def config_dict(self, strategy: Optional[Strategy] = None) -> Dict:
+        """Konfigurasi dalam bentuk dict (untuk file dan proses engine)"""
+        strategy = strategy or self.config.strategy
+        return {
+            'api_key': self.config.api_key,
+            'coin': self.config.coin,
+            'delay_ms': self.config.delay_ms,
+            'rate_limit': self.config.rate_limit,
+            'strategy': dict(strategy.__dict__)
+        }
+    
+    def apply_config_dict(self, data: Dict):
+        """Terapkan konfigurasi dari dict
+        
+        TypeError/ValueError untuk field strategi yang tidak dikenal atau
+        stop_window yang tidak valid, sebelum config apa pun diubah.
+        """
+        strategy = Strategy(**data.get('strategy', {}))
+        compiled = CompiledStrategy.compile(strategy)
+        
+        if data.get('api_key', '') != self.config.api_key:
+            self.balances.clear()
+        self.config.api_key = data.get('api_key', '')
+        self.config.coin = data.get('coin', 'BTC')
+        self.config.delay_ms = data.get('delay_ms', 300)
+        self.config.rate_limit = data.get('rate_limit', 0.0)
+        self.config.strategy = strategy
+        self._compiled = compiled
+    
+    def save_config(self, strategy: Optional[Strategy] = None):
         """Simpan konfigurasi ke file"""
         try:
-            data = {
-                'api_key': self.config.api_key,
-                'coin': self.config.coin,
-                'delay_ms': self.config.delay_ms,
-                'strategy': self.config.strategy.__dict__
-            }
+            data = self.config_dict(strategy)
             
             with open(SAVE_FILE, 'w') as f:
                 json.dump(data, f, indent=2)
@@ -707,10 +2490,14 @@ class DiceBot:
         
         coin = self.ui.get_input("Enter coin (BTC, LTC, DOGE, ETH)", self.config.coin)
         delay = self.ui.get_float_input("Delay between bets (ms)", self.config.delay_ms, 50, 5000)
+        rate_limit = self.ui.get_float_input("Shared rate limit per API key (bets/sec, 0 = off)", self.config.rate_limit, 0)
         
+        if api_key != self.config.api_key:
+            self.balances.clear()
         self.config.api_key = api_key
         self.config.coin = coin.upper()
         self.config.delay_ms = int(delay)
+        self.config.rate_limit = rate_limit
         
         self.save_config()
         self.ui.print_log(f"API configured: Coin={coin}, Delay={delay}ms", "✅", "green")
@@ -730,7 +2517,6 @@ class DiceBot:
         
         if 1 <= choice <= 10:
             selected_strategy = self.PRESET_STRATEGIES[choice]
-            self.config.strategy = selected_strategy
             
             # Tampilkan detail strategi
             self.ui.print_header()
@@ -744,6 +2530,7 @@ class DiceBot:
                 f"Stop Profit: {selected_strategy.auto_stop_profit:.8f} BTC",
                 f"Stop Loss: {selected_strategy.auto_stop_loss:.8f} BTC",
                 f"Max Loss Streak: {selected_strategy.max_consecutive_losses}",
+                f"Stop Window: {selected_strategy.stop_window or 'Session'}",
                 f"Increase on Loss: {'Yes' if selected_strategy.increase_on_loss else 'No'}",
                 f"Max Bet: {selected_strategy.max_bet_percentage}% of balance"
             ]
@@ -752,7 +2539,25 @@ class DiceBot:
             
             confirm = self.ui.get_input("Load this strategy? (yes/no)", "yes")
             if confirm.lower() == 'yes':
-                self.save_config()
+                # Stop profit/loss dihitung atas sesi atau window bergulir
+                window = self.ui.get_input(
+                    f"Stop rules window (session, {', '.join(WINDOW_LABELS)})",
+                    selected_strategy.stop_window or "session"
+                ).strip().lower()
+                if window == "session":
+                    window = ""
+                if window and window not in WINDOW_LABELS:
+                    self.ui.print_log("Invalid stop window", "❌", "red")
+                    return
+                if window != selected_strategy.stop_window:
+                    selected_strategy = replace(selected_strategy, stop_window=window)
+                
+                if self.running:
+                    keep = self.ui.get_input("Keep current win/loss streaks? (yes/no)", "yes")
+                    self.swap_strategy(selected_strategy, keep.lower() == 'yes')
+                else:
+                    self.config.strategy = selected_strategy
+                self.save_config(selected_strategy)
                 self.ui.print_log(f"Strategy '{selected_strategy.name}' loaded!", "🚀", "green")
             else:
                 self.ui.print_log("Strategy selection cancelled", "⚠️", "yellow")
@@ -770,59 +2575,82 @@ class DiceBot:
         
         return "\n".join(lines)
     
-    def check_balance(self):
-        """Cek balance dari API"""
+    def check_balance(self, use_cache: bool = False):
+        """Cek balance dari API (atau dari cache jika use_cache dan masih segar)"""
         if not self.config.api_key:
             self.ui.print_log("Please setup API key first", "⚠️", "yellow")
             return
         
-        self.ui.print_log("Checking balance...", "🔄", "blue")
+        balance = self.balances.get(self.config.coin) if use_cache else None
+        if balance is not None:
+            source = " (cached)"
+        else:
+            self.ui.print_log("Checking balance...", "🔄", "blue")
+            balance = self.fetch_balances([self.config.coin])[self.config.coin]
+            source = ""
         
-        balance = self.api.get_balance(self.config.coin, self.config.api_key)
         if balance is not None:
             self.stats['current_balance'] = balance
-            self.ui.print_log(f"Balance: {balance:.8f} {self.config.coin}", "💰", "green")
+            self.ui.print_log(f"Balance: {balance:.8f} {self.config.coin}{source}", "💰", "green")
             
             if self.initial_balance == 0:
                 self.initial_balance = balance
                 self.config.initial_balance = balance
-                self.daily_start_balance = balance
         else:
             self.ui.print_log("Failed to get balance", "❌", "red")
     
+    def fetch_balances(self, coins: List[str]) -> Dict[str, Optional[float]]:
+        """Ambil balance beberapa coin secara paralel dan simpan ke cache"""
+        if self.async_api is not None:
+            balances = self.engine.run(self.async_api.get_balances(coins, self.config.api_key))
+        else:
+            balances = self.api.get_balances(coins, self.config.api_key)
+        
+        for coin, balance in balances.items():
+            if balance is not None:
+                self.balances.put(coin, balance)
+        return balances
+    
+    def view_portfolio(self):
+        """Tampilkan balance semua coin, hanya coin dengan cache basi yang di-request"""
+        self.ui.print_header()
+        
+        if not self.config.api_key:
+            self.ui.print_log("Please setup API key first", "⚠️", "yellow")
+        else:
+            stale = self.balances.stale(PORTFOLIO_COINS)
+            if stale:
+                self.ui.print_log(f"Fetching balances: {', '.join(stale)}", "🔄", "blue")
+                self.fetch_balances(stale)
+            self.ui.print_portfolio(self.balances.rows(PORTFOLIO_COINS), self.config.coin)
+        
+        input("\nPress Enter to continue...")
+    
+    @property
+    def compiled(self) -> CompiledStrategy:
+        """Versi compiled dari strategi aktif (dikompilasi ulang jika strategi berganti)"""
+        compiled = self._compiled
+        if compiled is None or compiled.strategy is not self.config.strategy:
+            compiled = self._compiled = CompiledStrategy.compile(self.config.strategy)
+        return compiled
+    
     def calculate_next_bet(self) -> float:
         """Hitung jumlah taruhan berikutnya berdasarkan strategi"""
         if not self.config.strategy:
             return MIN_BET
         
-        strat = self.config.strategy
-        current_balance = self.stats['current_balance']
-        
-        # Base bet amount
-        base_bet = strat.bet_amount
-        
-        # Adjust based on streaks
-        if self.stats['consecutive_losses'] > 0 and strat.increase_on_loss:
-            base_bet *= (strat.loss_increase_multiplier ** min(
-                self.stats['consecutive_losses'], 
-                strat.max_consecutive_losses
-            ))
-        
-        elif self.stats['consecutive_wins'] > 0 and strat.decrease_on_win:
-            base_bet *= (strat.win_decrease_multiplier ** self.stats['consecutive_wins'])
-        
-        # Apply percentage limits
-        max_bet = current_balance * (strat.max_bet_percentage / 100.0)
-        min_bet = current_balance * (strat.min_bet_percentage / 100.0)
-        
-        base_bet = max(min_bet, min(base_bet, max_bet))
-        
-        # Ensure minimum bet
-        base_bet = max(base_bet, MIN_BET)
+        stats = self.stats
+        base_bet = self.compiled.next_bet(
+            stats['current_balance'],
+            stats['consecutive_wins'],
+            stats['consecutive_losses']
+        )
         
         # Update stats
-        self.stats['max_bet_used'] = max(self.stats['max_bet_used'], base_bet)
-        self.stats['min_bet_used'] = min(self.stats['min_bet_used'], base_bet)
+        if base_bet > stats['max_bet_used']:
+            stats['max_bet_used'] = base_bet
+        if base_bet < stats['min_bet_used']:
+            stats['min_bet_used'] = base_bet
         
         return round(base_bet, 8)
     
@@ -831,37 +2659,77 @@ class DiceBot:
         if not self.config.strategy:
             return True
         
-        strat = self.config.strategy
+        compiled = self.compiled
         current_balance = self.stats['current_balance']
-        total_profit = self.stats['total_profit']
         
-        # Check profit target
-        if strat.auto_stop_profit > 0 and total_profit >= strat.auto_stop_profit:
-            self.ui.print_log(f"🎯 Profit target reached! (+{total_profit:.8f} BTC)", "🎯", "green")
+        if compiled.stop_window:
+            # Stop profit/loss dari window bergulir, bukan total sesi
+            total_profit = self.rolling[compiled.stop_window].profit_at(self.now())
+            drawdown = -total_profit
+            scope = f" in last {compiled.stop_window}"
+        else:
+            total_profit = self.stats['total_profit']
+            drawdown = self.initial_balance - current_balance
+            scope = ""
+        
+        reason = compiled.stop_reason(total_profit, drawdown, self.stats['consecutive_losses'])
+        
+        if reason == 'profit':
+            self.ui.print_log(f"🎯 Profit target reached{scope}! (+{total_profit:.8f} BTC)", "🎯", "green")
+            self._emit_stop(reason, total_profit, compiled.stop_window)
             return False
         
-        # Check stop loss
-        if strat.auto_stop_loss > 0 and self.initial_balance - current_balance >= strat.auto_stop_loss:
-            self.ui.print_log(f"🛑 Stop loss triggered! (-{self.initial_balance - current_balance:.8f} BTC)", "🛑", "red")
+        if reason == 'loss':
+            self.ui.print_log(f"🛑 Stop loss triggered{scope}! (-{drawdown:.8f} BTC)", "🛑", "red")
+            self._emit_stop(reason, total_profit, compiled.stop_window)
             return False
         
-        # Check max consecutive losses
-        if strat.max_consecutive_losses > 0 and \
-           self.stats['consecutive_losses'] >= strat.max_consecutive_losses:
+        if reason == 'streak':
             self.ui.print_log(f"⚠️ Max consecutive losses reached ({self.stats['consecutive_losses']})", "⚠️", "yellow")
+            self._emit_stop(reason, self.stats['total_profit'])
             return False
         
         # Check daily target progress (untuk strategi daily target)
-        if strat.strategy_type == "daily_target" and self.daily_start_balance > 0:
-            daily_profit = current_balance - self.daily_start_balance
-            daily_target = self.daily_start_balance * 0.10  # 10% target
+        if compiled.daily_target:
+            daily_profit, daily_target = self.daily_window(current_balance)
             
-            if daily_profit >= daily_target:
+            if daily_target > 0 and daily_profit >= daily_target:
                 self.ui.print_log(f"🎯 Daily 10% target achieved! (+{daily_profit:.8f} BTC)", "🎯", "green")
+                self._emit_stop('daily', daily_profit, "24h")
                 return False
         
         return True
     
+    def daily_window(self, balance: float) -> Tuple[float, float]:
+        """Profit 24 jam bergulir dan target 10% dari balance di awal window"""
+        daily_profit = self.rolling['24h'].profit_at(self.now())
+        return daily_profit, (balance - daily_profit) * 0.10
+    
+    def swap_strategy(self, strategy: Strategy, keep_streaks: bool = True):
+        """Ganti strategi secara atomik tanpa menghentikan loop
+        
+        Strategi dikompilasi di thread pemanggil lalu dipasang oleh _run_loop
+        di batas bet berikutnya. Stats sesi dan balance tetap berlanjut.
+        """
+        swap = (CompiledStrategy.compile(strategy), keep_streaks)
+        if self.running:
+            self.pending_swaps.append(swap)
+            self.ui.print_log(f"Strategy '{strategy.name}' queued for next bet", "🔁", "cyan")
+        else:
+            self._apply_swap(swap)
+    
+    def _apply_swap(self, swap: Tuple[CompiledStrategy, bool]):
+        """Pasang strategi hasil swap (dipanggil di batas bet)"""
+        compiled, keep_streaks = swap
+        self.config.strategy = compiled.strategy
+        self._compiled = compiled
+        
+        if not keep_streaks:
+            self.stats['consecutive_wins'] = 0
+            self.stats['consecutive_losses'] = 0
+        
+        self.ui.print_log(f"Strategy swapped to '{compiled.strategy.name}'", "🔁", "green")
+    
     def start(self):
         """Start bot"""
         if not self.config.api_key:
@@ -872,17 +2740,47 @@ class DiceBot:
             self.ui.print_log("Bot is already running", "⚠️", "yellow")
             return
         
-        # Cek balance awal
-        self.check_balance()
+        # Strategi tidak valid (mis. stop_window) ditolak sebelum loop berjalan
+        try:
+            self.compiled
+        except ValueError as e:
+            self.ui.print_log(f"Invalid strategy: {e}", "❌", "red")
+            return
+        
+        # Cek balance awal (balance live dari sesi sebelumnya dipakai jika masih segar)
+        self.check_balance(use_cache=True)
         
         if self.stats['current_balance'] <= 0:
             self.ui.print_log("Insufficient balance to start", "❌", "red")
             return
         
+        self._begin_session()
+        
+        # Tampilkan strategi yang dipilih
+        self.ui.print_log(f"Starting with strategy: {self.config.strategy.name}", "🚀", "green")
+        self.ui.print_log(f"Target: {self.config.strategy.auto_stop_profit:.8f} BTC | Stop Loss: {self.config.strategy.auto_stop_loss:.8f} BTC", "🎯", "cyan")
+        
+        # Start bot thread (atau coroutine di engine async)
+        self.running = True
+        self.stop_event.clear()
+        if self.engine is not None:
+            self.future = self.engine.submit(self._run_loop_async())
+        else:
+            self.thread = threading.Thread(target=self._run_loop, daemon=True)
+            self.thread.start()
+        
+        self.config.running = True
+        self.publish_stats()
+        if self.status is not None:
+            self.status.publish()
+        self._emit_session('session_start')
+        self.ui.print_log("Bot started successfully!", "✅", "green")
+    
+    def _begin_session(self):
+        """Reset stats dan balance awal untuk sesi baru"""
         self.initial_balance = self.stats['current_balance']
         self.config.initial_balance = self.initial_balance
         self.config.session_start = time.time()
-        self.daily_start_balance = self.initial_balance
         
         # Reset stats
         self.stats['start_time'] = time.time()
@@ -896,19 +2794,17 @@ class DiceBot:
         self.stats['max_bet_used'] = 0.0
         self.stats['min_bet_used'] = float('inf')
         self.stats['daily_progress'] = 0.0
+        self.curve.reset()
         
-        # Tampilkan strategi yang dipilih
-        self.ui.print_log(f"Starting with strategy: {self.config.strategy.name}", "🚀", "green")
-        self.ui.print_log(f"Target: {self.config.strategy.auto_stop_profit:.8f} BTC | Stop Loss: {self.config.strategy.auto_stop_loss:.8f} BTC", "🎯", "cyan")
-        
-        # Start bot thread
-        self.running = True
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
-        
-        self.config.running = True
-        self.ui.print_log("Bot started successfully!", "✅", "green")
+        if self.shadow is not None:
+            self.shadow.close()
+            self.shadow = None
+        if self.shadow_enabled:
+            live_name = self.config.strategy.name
+            self.shadow = ShadowEvaluator(
+                [s for s in self.PRESET_STRATEGIES.values() if s.name != live_name],
+                self.initial_balance
+            )
     
     def stop(self):
         """Stop bot"""
@@ -919,99 +2815,378 @@ class DiceBot:
         self.running = False
         self.stop_event.set()
         
-        if self.thread:
+        # stop() juga dipanggil dari dalam loop saat stop condition tercapai
+        if self.thread and self.thread is not threading.current_thread():
             self.thread.join(timeout=2.0)
+        if self.future is not None and not self.engine.in_engine_thread():
+            try:
+                self.future.result(timeout=2.0)
+            except Exception:
+                pass
+        
+        if self.recorder is not None:
+            self.recorder.flush()
         
         self.config.running = False
+        self.publish_stats()
+        if self.status is not None:
+            self.status.publish()
+        self._emit_session('session_stop')
         self.ui.print_log("Bot stopped", "⏹️", "yellow")
         
         # Tampilkan final stats
         self.update_stats_display()
     
+    def _next_bet(self) -> Optional[Tuple[float, Dict]]:
+        """Persiapan satu bet: swap strategi, stats display, stop conditions
+        
+        Mengembalikan (bet_amount, bet_data), atau None jika bot harus berhenti.
+        """
+        # Strategi baru dari swap_strategy dipasang di batas bet, urut sesuai antrian
+        swaps = self.pending_swaps
+        while swaps:
+            self._apply_swap(swaps.popleft())
+        
+        # Update stats display setiap 5 detik
+        if not self.quiet:
+            current_time = time.time()
+            if current_time - self.last_stats_update >= 5.0:
+                self.update_stats_display()
+                self.last_stats_update = current_time
+        
+        # Cek stop conditions
+        if not self.check_stop_conditions():
+            self.stop()
+            return None
+        
+        # Batas portfolio dilanggar oleh sesi mana pun
+        if self.risk is not None and self.risk.breached:
+            self._emit_stop('portfolio', self.stats['total_profit'])
+            self.stop()
+            return None
+        
+        # Hitung bet amount
+        bet_amount = self.calculate_next_bet()
+        return bet_amount, self._build_bet_data(bet_amount)
+    
+    def _rate_limit_wait(self) -> float:
+        """Detik sampai token rate limit sesi tersedia (0.0 jika nonaktif)"""
+        if self.config.rate_limit <= 0:
+            return 0.0
+        return SharedRateLimiter.get(self.config.api_key, self.config.rate_limit).peek()
+    
     def _run_loop(self):
         """Loop utama bot"""
-        bet_counter = 0
-        
         while self.running and not self.stop_event.is_set():
             try:
-                # Update stats display setiap 5 detik
-                current_time = time.time()
-                if current_time - self.last_stats_update >= 5.0:
-                    self.update_stats_display()
-                    self.last_stats_update = current_time
+                prepared = self._next_bet()
+                if prepared is None:
+                    break
+                bet_amount, bet_data = prepared
                 
-                # Cek stop conditions
-                if not self.check_stop_conditions():
-                    self.stop()
+                # Tunggu token rate limit dulu agar rate rendah tidak menghabiskan deadline
+                wait = self._rate_limit_wait()
+                while wait > 0.0 and not self.stop_event.is_set():
+                    self.sleep(wait)
+                    wait = self._rate_limit_wait()
+                if self.stop_event.is_set():
                     break
                 
-                # Hitung bet amount
-                bet_amount = self.calculate_next_bet()
+                # Place bet, semua retry dibatasi BET_DEADLINE
+                result = None
+                deadline = time.monotonic() + BET_DEADLINE
+                for retry in range(MAX_RETRIES):
+                    result = self.api.place_bet(
+                        self.config.coin,
+                        self.config.api_key,
+                        bet_data,
+                        deadline,
+                        self.config.rate_limit
+                    )
+                    if result or self.stop_event.is_set() or time.monotonic() >= deadline:
+                        break
+                    self.sleep(0.1)
                 
-                # Generate client seed
-                client_seed = ''.join(random.choices(string.ascii_letters + string.digits, k=16))
+                if result:
+                    self._handle_result(result, bet_amount)
+                elif self.hooks is not None and not self.stop_event.is_set():
+                    self._emit_error(f"Bet failed after {MAX_RETRIES} attempts")
                 
-                # Siapkan data bet
-                bet_data = {
-                    "Bet": bet_amount,
-                    "Payout": self.config.strategy.payout,
-                    "UnderOver": self.config.strategy.under_over,
-                    "ClientSeed": client_seed
-                }
+                # Delay antara bets
+                self.sleep(self.config.delay_ms / 1000.0)
+                
+            except Exception as e:
+                self.ui.print_log(f"Error in betting loop: {e}", "❌", "red")
+                if self.hooks is not None:
+                    self._emit_error(f"Error in betting loop: {e}")
+                self.sleep(1.0)
+    
+    async def _run_loop_async(self):
+        """Loop utama bot sebagai coroutine di AsyncEngine"""
+        while self.running and not self.stop_event.is_set():
+            try:
+                prepared = self._next_bet()
+                if prepared is None:
+                    break
+                bet_amount, bet_data = prepared
+                
+                # Tunggu token rate limit dulu agar rate rendah tidak menghabiskan deadline
+                wait = self._rate_limit_wait()
+                while wait > 0.0 and not self.stop_event.is_set():
+                    await asyncio.sleep(wait)
+                    wait = self._rate_limit_wait()
+                if self.stop_event.is_set():
+                    break
                 
-                # Place bet
+                # Place bet, semua retry dibatasi BET_DEADLINE
                 result = None
+                deadline = time.monotonic() + BET_DEADLINE
                 for retry in range(MAX_RETRIES):
-                    result = self.api.place_bet(
+                    result = await self.async_api.place_bet(
                         self.config.coin,
                         self.config.api_key,
-                        bet_data
+                        bet_data,
+                        deadline,
+                        self.config.rate_limit
                     )
-                    if result:
+                    if result or self.stop_event.is_set() or time.monotonic() >= deadline:
                         break
-                    time.sleep(0.1)
+                    await asyncio.sleep(0.1)
                 
                 if result:
-                    # Update stats
-                    self.stats['total_bets'] += 1
-                    self.stats['total_wagered'] += bet_amount
-                    self.stats['total_profit'] += result.profit
-                    self.stats['current_balance'] = result.balance
-                    
-                    # Update streaks
-                    if result.profit > 0:
-                        self.stats['total_wins'] += 1
-                        self.stats['consecutive_wins'] += 1
-                        self.stats['consecutive_losses'] = 0
-                    else:
-                        self.stats['total_losses'] += 1
-                        self.stats['consecutive_losses'] += 1
-                        self.stats['consecutive_wins'] = 0
-                    
-                    # Update daily progress untuk strategi daily target
-                    if self.config.strategy.strategy_type == "daily_target" and self.daily_start_balance > 0:
-                        daily_profit = result.balance - self.daily_start_balance
-                        daily_target = self.daily_start_balance * 0.10
-                        if daily_target > 0:
-                            self.stats['daily_progress'] = (daily_profit / daily_target) * 100
-                    
-                    # Tampilkan hasil
-                    self.ui.print_bet_result(
-                        result,
-                        self.stats['total_profit'],
-                        self.stats['consecutive_wins'],
-                        self.stats['consecutive_losses']
-                    )
-                    
-                    bet_counter += 1
-                    self.bet_times.append(time.time())
+                    self._handle_result(result, bet_amount)
+                elif self.hooks is not None and not self.stop_event.is_set():
+                    self._emit_error(f"Bet failed after {MAX_RETRIES} attempts")
                 
                 # Delay antara bets
-                time.sleep(self.config.delay_ms / 1000.0)
+                await asyncio.sleep(self.config.delay_ms / 1000.0)
                 
             except Exception as e:
                 self.ui.print_log(f"Error in betting loop: {e}", "❌", "red")
-                time.sleep(1.0)
+                if self.hooks is not None:
+                    self._emit_error(f"Error in betting loop: {e}")
+                await asyncio.sleep(1.0)
+    
+    def _build_bet_data(self, bet_amount: float) -> Dict:
+        """Siapkan payload bet"""
+        # Generate client seed
+        client_seed = ''.join(random.choices(string.ascii_letters + string.digits, k=16))
+        
+        return {
+            "Bet": bet_amount,
+            "Payout": self.config.strategy.payout,
+            "UnderOver": self.config.strategy.under_over,
+            "ClientSeed": client_seed
+        }
+    
+    def _handle_result(self, result: BetResult, bet_amount: float):
+        """Update stats, rekaman dan tampilan dari satu hasil bet"""
+        stats = self.stats
+        stats['total_bets'] += 1
+        stats['total_wagered'] += bet_amount
+        stats['total_profit'] += result.profit
+        stats['current_balance'] = result.balance
+        self.balances.put(self.config.coin, result.balance, "live")
+        
+        # Update streaks
+        if result.profit > 0:
+            stats['total_wins'] += 1
+            stats['consecutive_wins'] += 1
+            stats['consecutive_losses'] = 0
+        else:
+            stats['total_losses'] += 1
+            stats['consecutive_losses'] += 1
+            stats['consecutive_wins'] = 0
+        
+        hooks = self.hooks
+        if hooks is not None:
+            self._emit_bet(hooks, result, bet_amount)
+        
+        self.rolling.add(result.timestamp, result.profit, bet_amount, result.profit > 0)
+        self.curve.add(stats['total_profit'])
+        
+        # Update daily progress untuk strategi daily target
+        if self.config.strategy.strategy_type == "daily_target":
+            daily_profit, daily_target = self.daily_window(result.balance)
+            if daily_target > 0:
+                stats['daily_progress'] = (daily_profit / daily_target) * 100
+        
+        if self.stats_segment is not None:
+            self.publish_stats()
+        
+        if self.shadow is not None:
+            self.shadow.feed(result.roll)
+        
+        if self.risk is not None:
+            self.risk.record(self.config.coin, result.profit)
+        
+        if self.fairness is not None:
+            for alert in self.fairness.add(result.roll, self.config.strategy.chance, result.profit > 0):
+                self.ui.print_log(f"Roll fairness: {alert}", "🚨", "red")
+        
+        if self.recorder is not None:
+            self.recorder.write(json.dumps({
+                'bet_id': result.bet_id,
+                'roll': result.roll,
+                'profit': result.profit,
+                'balance': result.balance,
+                'timestamp': result.timestamp
+            }) + "\n")
+        
+        # Tampilkan hasil
+        if not self.quiet:
+            self.ui.print_bet_result(
+                result,
+                stats['total_profit'],
+                stats['consecutive_wins'],
+                stats['consecutive_losses']
+            )
+        
+        self.bet_times.append(time.time())
+        
+        if self.status is not None:
+            self.status.maybe_publish()
+    
+    def _emit_bet(self, hooks: HookBus, result: BetResult, bet_amount: float):
+        """Event bet dan streak (5, 10, 20, ... beruntun) untuk hook"""
+        if 'bet' in hooks.kinds:
+            hooks.emit('bet', {
+                'coin': self.config.coin,
+                'bet_id': result.bet_id,
+                'roll': result.roll,
+                'bet': bet_amount,
+                'profit': result.profit,
+                'balance': result.balance
+            })
+        
+        stats = self.stats
+        streak = stats['consecutive_losses'] or stats['consecutive_wins']
+        if streak >= HOOK_STREAK_LENGTH and streak % HOOK_STREAK_LENGTH == 0:
+            steps = streak // HOOK_STREAK_LENGTH
+            if steps & (steps - 1) == 0:
+                hooks.emit('streak', {
+                    'coin': self.config.coin,
+                    'kind': 'loss' if stats['consecutive_losses'] else 'win',
+                    'length': streak,
+                    'balance': result.balance
+                })
+    
+    def _emit_stop(self, reason: str, profit: float, window: str = ""):
+        """Event stop condition untuk hook"""
+        if self.hooks is not None:
+            self.hooks.emit('stop', {
+                'coin': self.config.coin,
+                'reason': reason,
+                'profit': profit,
+                'window': window or 'session',
+                'balance': self.stats['current_balance']
+            })
+    
+    def _emit_error(self, message: str):
+        self.hooks.emit('error', {'coin': self.config.coin, 'message': message})
+    
+    def _emit_session(self, kind: str):
+        """Event session_start / session_stop untuk hook"""
+        if self.hooks is not None:
+            stats = self.stats
+            self.hooks.emit(kind, {
+                'coin': self.config.coin,
+                'strategy': self.config.strategy.name,
+                'balance': stats['current_balance'],
+                'total_bets': stats['total_bets'],
+                'total_profit': stats['total_profit']
+            })
+    
+    def run_replay(self, api: 'ReplayAPI') -> Dict:
+        """Jalankan loop atas stream roll rekaman secepat mungkin (tanpa sleep)"""
+        self.api = api
+        self.sleep = lambda seconds: None
+        # Jam simulasi replay: satu bet per detik, sama dengan timestamp BetResult
+        self.now = lambda: float(api.index)
+        self.quiet = True
+        api.on_exhausted = self.stop_event.set
+        
+        self.stats['current_balance'] = api.get_balance(self.config.coin, self.config.api_key)
+        self._begin_session()
+        
+        self.running = True
+        self.stop_event.clear()
+        self._run_loop()
+        self.running = False
+        
+        self.stats['session_time'] = time.time() - self.stats['start_time']
+        return self.stats
+    
+    def start_profiler(self, seconds: float = PROFILE_DEFAULT_SECONDS) -> Optional[SamplingProfiler]:
+        """Pasang profiler sampling ke thread loop taruhan selama beberapa detik"""
+        if not self.running:
+            self.ui.print_log("Bot is not running", "⚠️", "yellow")
+            return None
+        
+        if self.profiler is not None and self.profiler.active:
+            self.ui.print_log("Profiler is already running", "⚠️", "yellow")
+            return None
+        
+        loop_thread = self.engine.thread if self.engine is not None else self.thread
+        output = f"cgbot-profile-{os.getpid()}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+        
+        def done(profiler: SamplingProfiler):
+            self.ui.print_log(f"Profile: {profiler.summary()}", "🔬", "cyan")
+            self.ui.print_log(f"Saved to {profiler.output}", "💾", "cyan")
+        
+        self.profiler = SamplingProfiler(
+            loop_thread.ident, seconds, output, done,
+            self.engine.loop if self.engine is not None else None
+        )
+        self.profiler.start()
+        self.ui.print_log(f"Profiling betting thread for {seconds:.0f}s", "🔬", "cyan")
+        return self.profiler
+    
+    def enable_status(self):
+        """Mulai publikasi state live ke file status untuk 'cgbot top'"""
+        if self.status is None:
+            self.status = StatusPublisher(self)
+            self.status.publish()
+    
+    def latency_percentiles(self) -> Tuple[float, float, float]:
+        """p50/p90/p99 latency placebet (detik) dari backend aktif"""
+        api = self.async_api if self.async_api is not None else self.api
+        tracker = getattr(api, 'latency', {}).get('placebet')
+        if tracker is None:
+            return 0.0, 0.0, 0.0
+        return tracker.percentiles(50, 90, 99)
+    
+    def publish_stats(self):
+        """Tulis snapshot stats ke segment shared memory jika ada"""
+        if self.stats_segment is None:
+            return
+        stats = self.stats
+        self.stats_segment.write(tuple(
+            self.running if key == 'running' else stats[key]
+            for key in ENGINE_STATS_KEYS
+        ))
+    
+    def shutdown(self):
+        """Hentikan bot dan lepaskan resource sebelum keluar"""
+        if self.running:
+            self.stop()
+        
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        
+        if self.shadow is not None:
+            self.shadow.close()
+            self.shadow = None
+        
+        if self.status is not None:
+            self.status.close()
+            self.status = None
+        
+        if self.hooks is not None:
+            for note in self.hooks.close():
+                self.ui.print_log(f"Hook {note}", "⚠️", "yellow")
+            self.hooks = None
     
     def update_stats_display(self):
         """Update dan tampilkan statistics"""
@@ -1029,13 +3204,28 @@ class DiceBot:
             
             # Tampilkan stats setiap 30 detik atau saat stop
             if session_time % 30 < 1 or not self.running:
-                self.ui.print_stats(self.stats)
+                self.ui.print_stats(self.stats, self.curve)
+    
+    def analytics(self) -> Dict:
+        """Kurva profit, window bergulir dan laporan fairness untuk tampilan statistics"""
+        return {
+            'curve': self.curve,
+            'windows': self.rolling.snapshots(time.time()) if self.rolling['24h'].first is not None else None,
+            'fairness': (self.fairness.report(), self.fairness.threshold) if self.fairness is not None else None
+        }
     
     def view_statistics(self):
         """Tampilkan statistics saat ini"""
         self.ui.print_header()
         if self.stats['total_bets'] > 0:
-            self.ui.print_stats(self.stats)
+            analytics = self.analytics()
+            self.ui.print_stats(self.stats, analytics['curve'])
+            if analytics['windows'] is not None:
+                self.ui.print_windows(analytics['windows'])
+            if self.shadow is not None:
+                self.ui.print_shadow(self.shadow.rows(), self.stats['total_profit'], self.shadow.lag)
+            if analytics['fairness'] is not None:
+                self.ui.print_fairness(*analytics['fairness'])
         else:
             self.ui.print_log("No statistics available yet", "📊", "yellow")
         
@@ -1048,10 +3238,928 @@ class DiceBot:
         
         input("\nPress Enter to continue...")
 
+# ============== PROCESS ISOLATION ==============
+
+def _engine_process_main(shm_name: str, conn, hook_specs: List[str], status: bool,
+                         fairness: bool, gc_freeze: bool, engine_name: str = "thread"):
+    """Entry point proses engine: jalankan DiceBot dan terima perintah dari pipe"""
+    # Ctrl+C ditangani oleh proses UI
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    engine = AsyncEngine() if engine_name == "async" else None
+    bot = DiceBot(TerminalManager(), engine)
+    bot.stats_segment = SeqlockStruct(shm.buf, ENGINE_STATS_FIELDS)
+    if status:
+        bot.enable_status()
+    if fairness:
+        bot.fairness = RollFairnessMonitor()
+    bot.hooks = build_hook_bus(hook_specs)
+    
+    # Loop taruhan berjalan di proses ini, jadi objek startup-nya yang dibekukan
+    if gc_freeze:
+        freeze_startup_objects()
+    
+    try:
+        while True:
+            if not conn.poll(0.5):
+                continue
+            
+            command, payload = conn.recv()
+            
+            if command == 'start':
+                bot.apply_config_dict(payload)
+                bot.start()
+            elif command == 'stop':
+                if bot.running:
+                    bot.stop()
+            elif command == 'profile':
+                bot.start_profiler(payload)
+            elif command == 'analytics':
+                conn.send(bot.analytics())
+            elif command == 'swap':
+                strategy_data, keep_streaks = payload
+                bot.swap_strategy(Strategy(**strategy_data), keep_streaks)
+            elif command == 'shutdown':
+                break
+    except (EOFError, OSError):
+        pass
+    finally:
+        bot.shutdown()
+        bot.stats_segment = None
+        if engine is not None:
+            engine.close()
+        shm.close()
+
+class IsolatedDiceBot(DiceBot):
+    """DiceBot dengan betting loop di proses terpisah
+    
+    Menu, input dan rendering tetap di proses ini, sedangkan loop taruhan
+    berjalan di proses engine dengan GIL sendiri. Stats dibaca dari segment
+    shared memory, perintah dikirim lewat pipe.
+    """
+    
+    def __init__(self, ui: TerminalManager, hook_specs: Optional[List[str]] = None,
+                 status: bool = True, fairness: bool = True, gc_freeze: bool = False,
+                 engine_name: str = "thread"):
+        super().__init__(ui)
+        
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=SeqlockStruct.size_for(ENGINE_STATS_FIELDS)
+        )
+        self.segment = SeqlockStruct(self.shm.buf, ENGINE_STATS_FIELDS)
+        
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_engine_process_main,
+            args=(self.shm.name, child_conn, hook_specs or [], status, fairness, gc_freeze, engine_name),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+    
+    def _snapshot(self) -> Dict:
+        """Snapshot stats terbaru dari proses engine"""
+        segment = self.__dict__.get('segment')
+        return segment.read() if segment is not None else {}
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._snapshot().get('running', False))
+    
+    @running.setter
+    def running(self, value: bool):
+        # Status running dimiliki proses engine
+        pass
+    
+    @property
+    def stats(self) -> Dict:
+        snapshot = self._snapshot()
+        snapshot.pop('running', None)
+        self._stats.update(snapshot)
+        return self._stats
+    
+    @stats.setter
+    def stats(self, value: Dict):
+        self._stats = value
+    
+    def _send(self, command: str, payload: Any = None) -> bool:
+        """Kirim perintah ke proses engine"""
+        if not self.process.is_alive():
+            self.ui.print_log("Engine process is not running", "❌", "red")
+            return False
+        self.conn.send((command, payload))
+        return True
+    
+    def start(self):
+        """Start bot di proses engine"""
+        if not self.config.api_key:
+            self.ui.print_log("Please setup API key first", "⚠️", "yellow")
+            return
+        
+        if self.running:
+            self.ui.print_log("Bot is already running", "⚠️", "yellow")
+            return
+        
+        if self._send('start', self.config_dict()):
+            self.ui.print_log(f"Starting with strategy: {self.config.strategy.name} (engine process)", "🚀", "green")
+    
+    def stop(self):
+        """Stop bot di proses engine"""
+        if not self.running:
+            self.ui.print_log("Bot is not running", "⚠️", "yellow")
+            return
+        
+        if self._send('stop'):
+            self.ui.print_log("Stop command sent to engine process", "⏹️", "yellow")
+    
+    def swap_strategy(self, strategy: Strategy, keep_streaks: bool = True):
+        """Swap strategi di proses engine tanpa restart loop"""
+        self.config.strategy = strategy
+        if self.running:
+            self._send('swap', (dict(strategy.__dict__), keep_streaks))
+    
+    def analytics(self) -> Dict:
+        """Kurva, window dan fairness dari proses engine (kosong jika engine tidak menjawab)"""
+        empty = {'curve': None, 'windows': None, 'fairness': None}
+        
+        # Buang jawaban terlambat dari permintaan sebelumnya
+        while self.conn.poll():
+            self.conn.recv()
+        
+        if not self._send('analytics') or not self.conn.poll(ENGINE_REPLY_TIMEOUT):
+            return empty
+        return self.conn.recv()
+    
+    def start_profiler(self, seconds: float = PROFILE_DEFAULT_SECONDS):
+        """Minta proses engine mem-profile thread loop taruhannya"""
+        if not self.running:
+            self.ui.print_log("Bot is not running", "⚠️", "yellow")
+            return None
+        self._send('profile', seconds)
+        return None
+    
+    def shutdown(self):
+        """Matikan proses engine dan lepaskan shared memory"""
+        if self.segment is None:
+            return
+        
+        if self.process.is_alive():
+            self._send('shutdown')
+            self.process.join(timeout=5.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        
+        self.conn.close()
+        self.segment = None
+        self.shm.close()
+        self.shm.unlink()
+
+# ============== STATUS VIEWER ==============
+
+def render_top(ui: TerminalManager, records: List[Dict]) -> str:
+    """Render tabel status semua bot (gaya top)"""
+    now = time.time()
+    header = (f"{'PID':>7} {'COIN':<5} {'STRATEGY':<22} {'STATE':<5} {'BALANCE':>12} {'PROFIT':>12} "
+              f"{'BETS':>8} {'W/L':>7} {'BET/S':>6} {'P50ms':>6} {'P99ms':>6} {'AGE':>5}")
+    lines = [
+        f"{ui.BOLD}CRYPTO.GAMES DICE BOT v{VERSION} — {len(records)} instance(s) — {datetime.now().strftime('%H:%M:%S')}{ui.RESET}",
+        "",
+        f"{ui.CYAN}{header}{ui.RESET}"
+    ]
+    
+    for record in records:
+        state = f"{ui.GREEN}RUN  {ui.RESET}" if record['running'] else f"{ui.GRAY}STOP {ui.RESET}"
+        profit_color = ui.GREEN if record['profit'] >= 0 else ui.RED
+        streak = f"+{record['win_streak']}" if record['win_streak'] else f"-{record['loss_streak']}"
+        lines.append(
+            f"{record['pid']:>7} {record['coin']:<5} {record['strategy'][:22]:<22} {state}"
+            f"{record['balance']:>12.8f} {profit_color}{record['profit']:>+12.8f}{ui.RESET} "
+            f"{record['bets']:>8} {streak:>7} {record['bets_per_second']:>6.2f} "
+            f"{record['latency_p50'] * 1000:>6.0f} {record['latency_p99'] * 1000:>6.0f} "
+            f"{now - record['updated']:>4.0f}s"
+        )
+    
+    if not records:
+        lines.append(f"{ui.GRAY}No running bot instances found in {STATUS_DIRECTORY}{ui.RESET}")
+    
+    return "\n".join(lines)
+
+def run_top_command(args: argparse.Namespace) -> int:
+    """Subcommand top: tampilkan semua instance bot di host ini"""
+    ui = TerminalManager()
+    try:
+        while True:
+            frame = render_top(ui, read_status_files())
+            # Pindah kursor ke awal dan bersihkan tanpa memanggil proses 'clear'
+            sys.stdout.write("\033[H\033[2J" + frame + "\n")
+            sys.stdout.flush()
+            if args.once:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+# ============== ORCHESTRATOR ==============
+
+class PortfolioRisk:
+    """Batas stop-loss dan take-profit agregat lintas sesi
+    
+    Profit dijumlahkan per coin (unit tiap coin berbeda) secara inkremental
+    setiap bet, jadi pengecekan batas selalu O(1).
+    """
+    
+    def __init__(self, limits: Dict[str, Dict[str, float]]):
+        self.limits = {
+            coin.upper(): (float(limit.get('stop_loss', 0.0)), float(limit.get('take_profit', 0.0)))
+            for coin, limit in limits.items()
+        }
+        self.profit: Dict[str, float] = {}
+        self.breached: Optional[str] = None
+        self.lock = threading.Lock()
+    
+    def record(self, coin: str, profit: float) -> bool:
+        """Catat profit satu bet, False jika batas portfolio terlampaui"""
+        with self.lock:
+            total = self.profit.get(coin, 0.0) + profit
+            self.profit[coin] = total
+        
+        limit = self.limits.get(coin)
+        if limit is None or self.breached:
+            return not self.breached
+        
+        stop_loss, take_profit = limit
+        if stop_loss > 0 and -total >= stop_loss:
+            self.breached = f"{coin} portfolio stop loss (-{-total:.8f})"
+        elif take_profit > 0 and total >= take_profit:
+            self.breached = f"{coin} portfolio take profit (+{total:.8f})"
+        return not self.breached
+
+class SessionOrchestrator:
+    """Menjalankan banyak sesi (API key x coin) dari satu config
+    
+    Semua sesi berbagi AsyncEngine (event loop dan connection pool) jika
+    aiohttp tersedia, atau satu CryptoGamesAPI bersama jika tidak.
+    
+    Format config:
+        {
+          "sessions": [
+            {"api_key": "...", "coin": "BTC", "delay_ms": 300, "preset": 2},
+            {"api_key": "...", "coin": "DOGE", "strategy": {...}}
+          ],
+          "limits": {"BTC": {"stop_loss": 0.00001, "take_profit": 0.00002}},
+          "rate_limit": 10
+        }
+    """
+    
+    SUMMARY_INTERVAL = 5.0
+    
+    def __init__(self, ui: TerminalManager, config: Dict):
+        self.ui = ui
+        self.risk = PortfolioRisk(config.get('limits', {}))
+        self.breach_reported = False
+        self.engine = AsyncEngine() if aiohttp is not None else None
+        shared_api = CryptoGamesAPI()
+        
+        self.bots: List[DiceBot] = []
+        for session in config.get('sessions', []):
+            bot = DiceBot(ui, self.engine, load_saved=False)
+            bot.api = shared_api
+            bot.quiet = True
+            bot.risk = self.risk
+            bot.enable_status()
+            bot.apply_config_dict({
+                'api_key': session.get('api_key', ''),
+                'coin': session.get('coin', 'BTC').upper(),
+                'delay_ms': session.get('delay_ms', 300),
+                'rate_limit': session.get('rate_limit', config.get('rate_limit', 0.0)),
+                'strategy': session.get('strategy', {})
+            })
+            preset = session.get('preset')
+            if preset is not None:
+                bot.config.strategy = DiceBot.PRESET_STRATEGIES[preset]
+            self.bots.append(bot)
+    
+    @staticmethod
+    def load(path: str) -> Dict:
+        """Baca config orchestrator (JSON)"""
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def validate(config: Any) -> Optional[str]:
+        """Pesan error untuk config yang tidak bisa dijalankan, None jika valid"""
+        if not isinstance(config, dict) or not config.get('sessions'):
+            return "No sessions configured"
+        
+        for number, session in enumerate(config['sessions'], 1):
+            if not isinstance(session, dict):
+                return f"Session {number}: expected an object"
+            
+            preset = session.get('preset')
+            if preset is not None and preset not in DiceBot.PRESET_STRATEGIES:
+                return f"Session {number}: Invalid strategy number"
+            
+            strategy = session.get('strategy', {})
+            if not isinstance(strategy, dict):
+                return f"Session {number}: strategy must be an object"
+            unknown = sorted(set(strategy) - set(Strategy.__dataclass_fields__))
+            if unknown:
+                return f"Session {number}: unknown strategy field {unknown[0]}"
+            try:
+                CompiledStrategy.compile(Strategy(**strategy))
+            except (TypeError, ValueError) as e:
+                return f"Session {number}: {e}"
+            
+            delay = session.get('delay_ms', 300)
+            if not isinstance(delay, (int, float)) or delay < MIN_DELAY:
+                return f"Session {number}: delay_ms must be at least {MIN_DELAY}"
+        return None
+    
+    def run(self):
+        """Start semua sesi dan tampilkan ringkasan sampai semua berhenti"""
+        for bot in self.bots:
+            bot.start()
+        
+        last_summary = time.time()
+        try:
+            while any(bot.running for bot in self.bots):
+                self.report_breach()
+                time.sleep(0.5)
+                if time.time() - last_summary >= self.SUMMARY_INTERVAL:
+                    self.print_summary()
+                    last_summary = time.time()
+        except KeyboardInterrupt:
+            self.ui.print_log("Interrupted, stopping all sessions", "⏹️", "yellow")
+        finally:
+            for bot in self.bots:
+                bot.shutdown()
+            self.report_breach()
+            self.print_summary()
+            if self.engine is not None:
+                self.engine.close()
+    
+    def report_breach(self):
+        """Laporkan pelanggaran batas portfolio sekali"""
+        if self.risk.breached and not self.breach_reported:
+            self.breach_reported = True
+            self.ui.print_log(f"Portfolio limit hit: {self.risk.breached}", "🛑", "red")
+    
+    def print_summary(self):
+        """Ringkasan per sesi dan total portfolio per coin"""
+        lines = []
+        for bot in self.bots:
+            stats = bot.stats
+            key = '***' + bot.config.api_key[-4:] if bot.config.api_key else '-'
+            status = "RUN" if bot.running else "STOP"
+            lines.append(
+                f"{bot.config.coin:<5}{key:<9}{bot.config.strategy.name[:20]:<21}"
+                f"{stats['total_bets']:>7} bets {stats['total_profit']:+.8f} {status}"
+            )
+        
+        lines.append("")
+        for coin, profit in sorted(self.risk.profit.items()):
+            stop_loss, take_profit = self.risk.limits.get(coin, (0.0, 0.0))
+            lines.append(f"{coin}: {profit:+.8f}  (stop -{stop_loss:.8f} / target +{take_profit:.8f})")
+        
+        print(self.ui.create_box("🗂️ PORTFOLIO SESSIONS", "\n".join(lines)))
+
+def run_orchestrate_command(args: argparse.Namespace) -> int:
+    """Subcommand orchestrate: jalankan semua sesi dari file config"""
+    ui = TerminalManager()
+    try:
+        config = SessionOrchestrator.load(args.file)
+    except OSError as e:
+        ui.print_log(f"Cannot read config: {e.strerror}", "❌", "red")
+        return 1
+    except json.JSONDecodeError as e:
+        ui.print_log(f"Invalid config JSON at line {e.lineno}", "❌", "red")
+        return 1
+    
+    error = SessionOrchestrator.validate(config)
+    if error is not None:
+        ui.print_log(error, "❌", "red")
+        return 1
+    
+    orchestrator = SessionOrchestrator(ui, config)
+    if args.gc_freeze:
+        freeze_startup_objects()
+    ui.print_log(f"Starting {len(orchestrator.bots)} sessions", "🚀", "green")
+    orchestrator.run()
+    return 0
+
+# ============== BENCHMARK ==============
+
+# Payload response placebet yang dipakai untuk benchmark parsing
+BENCH_BET_PAYLOAD = json.dumps({
+    "BetId": 123456789,
+    "Roll": 42.123,
+    "Profit": 0.00000002,
+    "Balance": 0.00123456,
+    "Target": "<49.50",
+    "ServerSeed": "a" * 64,
+    "NextServerSeedHash": "b" * 64
+})
+
+class _NullWriter:
+    """Sink stdout untuk benchmark rendering"""
+    
+    def write(self, text: str) -> int:
+        return len(text)
+    
+    def flush(self):
+        pass
+
+class _CannedResponse:
+    """Response HTTP tetap untuk benchmark"""
+    
+    status_code = 200
+    
+    def __init__(self, payload: str):
+        self.payload = payload
+    
+    def json(self) -> Dict:
+        return json.loads(self.payload)
+
+class _CannedSession:
+    """Pengganti requests.Session yang selalu mengembalikan payload yang sama"""
+    
+    def __init__(self, payload: str, limit: int = 0, on_limit: Optional[Callable[[], None]] = None):
+        self.response = _CannedResponse(payload)
+        self.calls = 0
+        self.limit = limit
+        self.on_limit = on_limit
+    
+    def get(self, url: str, **kwargs) -> _CannedResponse:
+        return self.response
+    
+    def post(self, url: str, **kwargs) -> _CannedResponse:
+        self.calls += 1
+        if self.calls == self.limit and self.on_limit is not None:
+            self.on_limit()
+        return self.response
+
+def _bench_bot(ui: TerminalManager) -> DiceBot:
+    """DiceBot dengan state tetap untuk benchmark"""
+    bot = DiceBot(ui)
+    bot.config = BotConfig(api_key="bench", coin="BTC", delay_ms=0)
+    bot.config.strategy = DiceBot.PRESET_STRATEGIES[7]
+    bot.initial_balance = 0.00123456
+    bot.stats['current_balance'] = 0.00123456
+    bot.stats['consecutive_losses'] = 3
+    bot.stats['start_time'] = time.time()
+    return bot
+
+def _bench_loop_iteration(ui: TerminalManager, iterations: int) -> float:
+    """Waktu total untuk sejumlah iterasi _run_loop penuh (tanpa network dan sleep)"""
+    bot = _bench_bot(ui)
+    bot.config.strategy = Strategy(auto_stop_profit=0, auto_stop_loss=0, max_consecutive_losses=0)
+    bot.api.session = _CannedSession(BENCH_BET_PAYLOAD, iterations, bot.stop_event.set)
+    bot.sleep = lambda seconds: None
+    bot.running = True
+    
+    started = time.perf_counter()
+    bot._run_loop()
+    return time.perf_counter() - started
+
+def run_benchmarks(iterations: int = 10000, repeats: int = 9) -> Dict[str, float]:
+    """Ukur overhead per bet dari fungsi-fungsi hot path (ns per operasi, terbaik dari beberapa ulangan)"""
+    results = {}
+    
+    with contextlib.redirect_stdout(_NullWriter()):
+        ui = TerminalManager()
+        ui.terminal_width = 120
+        ui.width_check_interval = float('inf')
+        bot = _bench_bot(ui)
+        
+        api = CryptoGamesAPI()
+        api.session = _CannedSession(BENCH_BET_PAYLOAD)
+        bet_data = bot._build_bet_data(0.00000004)
+        result = api.place_bet("BTC", "bench", bet_data)
+        box_content = "\n".join(f"Line {i}: {'x' * 40}" for i in range(10))
+        
+        def handle_result():
+            bot.stats['consecutive_losses'] = 3
+            bot._handle_result(result, 0.00000004)
+        
+        cases = {
+            'calculate_next_bet': bot.calculate_next_bet,
+            'check_stop_conditions': bot.check_stop_conditions,
+            'stats_update': handle_result,
+            'place_bet_parse': lambda: api.place_bet("BTC", "bench", bet_data),
+            'print_bet_result': lambda: ui.print_bet_result(result, 0.00000123, 0, 3),
+            'create_box': lambda: ui.create_box("BENCH", box_content),
+        }
+        
+        bot.quiet = True
+        for name, func in cases.items():
+            best = float('inf')
+            for _ in range(repeats):
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    func()
+                best = min(best, time.perf_counter() - started)
+            results[name] = best / iterations * 1e9
+        
+        best = min(_bench_loop_iteration(ui, iterations) for _ in range(repeats))
+        results['loop_iteration'] = best / iterations * 1e9
+    
+    return results
+
+def run_bench_command(args: argparse.Namespace) -> int:
+    """Subcommand bench: bandingkan hasil dengan baseline tersimpan"""
+    ui = TerminalManager()
+    results = run_benchmarks(args.iterations, args.repeats)
+    
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    
+    failed = []
+    lines = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base:
+            change = (value - base) / base * 100
+            regressed = value > base * (1 + args.threshold)
+            flag = " ✗" if regressed else ""
+            lines.append(f"{name:<24}{value:>10.0f} ns  (baseline {base:>8.0f} ns, {change:+6.1f}%){flag}")
+            if regressed:
+                failed.append(name)
+        else:
+            lines.append(f"{name:<24}{value:>10.0f} ns")
+    
+    print(ui.create_box("⏱️ ENGINE BENCHMARKS", "\n".join(lines)))
+    
+    if not baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        ui.print_log(f"Baseline saved to {args.baseline}", "💾", "green")
+        return 0
+    
+    if failed:
+        ui.print_log(f"{len(failed)} benchmark(s) regressed beyond {args.threshold:.0%}", "❌", "red")
+        return 1
+    
+    ui.print_log("No regressions", "✅", "green")
+    return 0
+
+# ============== SOAK TEST ==============
+
+# Bet minimum soak: warmup (min 1000 bet) ditambah fase terukur yang cukup panjang
+SOAK_MIN_BETS = 10000
+
+class _SimulatedSession:
+    """Pengganti requests.Session yang mensimulasikan API dengan RNG ber-seed"""
+    
+    def __init__(self, balance: float, chance: float, seed: int = 0):
+        self.balance = balance
+        self.chance = chance
+        self.random = random.Random(seed)
+        self.bet_id = 0
+        self.calls = 0
+        self.limit = 0
+        self.on_limit = None
+    
+    def get(self, url: str, **kwargs) -> _CannedResponse:
+        return _CannedResponse(json.dumps({"Balance": self.balance}))
+    
+    def post(self, url: str, **kwargs) -> _CannedResponse:
+        self.calls += 1
+        if self.calls == self.limit and self.on_limit is not None:
+            self.on_limit()
+        
+        bet_data = kwargs['json']
+        roll = round(self.random.uniform(0, 99.999), 3)
+        won = roll_wins(roll, self.chance, bet_data['UnderOver'])
+        profit = bet_profit(bet_data['Bet'], bet_data['Payout'], won)
+        self.balance = round(self.balance + profit, 8)
+        self.bet_id += 1
+        
+        return _CannedResponse(json.dumps({
+            "BetId": self.bet_id,
+            "Roll": roll,
+            "Profit": profit,
+            "Balance": self.balance
+        }))
+
+def _rss_bytes() -> int:
+    """Resident set size proses saat ini (0 jika tidak tersedia)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss adalah puncak RSS (KB di Linux, byte di macOS)
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except (ImportError, AttributeError):
+        return 0
+
+class GCPauseTracker:
+    """Mencatat jumlah dan durasi pause garbage collector lewat gc.callbacks"""
+    
+    def __init__(self):
+        self.started = 0.0
+        self.pauses = [0, 0, 0]
+        self.total = 0.0
+        self.longest = 0.0
+    
+    def __call__(self, phase: str, info: Dict):
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+        duration = time.perf_counter() - self.started
+        self.pauses[info.get('generation', 0)] += 1
+        self.total += duration
+        self.longest = max(self.longest, duration)
+    
+    def __enter__(self) -> 'GCPauseTracker':
+        gc.callbacks.append(self)
+        return self
+    
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+def _soak_bot(ui: TerminalManager, seed: int) -> Tuple[DiceBot, _SimulatedSession]:
+    """DiceBot dengan API simulasi dan monitor produksi aktif"""
+    bot = DiceBot(ui, load_saved=False)
+    bot.config = BotConfig(api_key="soak", coin="BTC", delay_ms=0)
+    bot.config.strategy = Strategy(
+        name="SOAK", auto_stop_profit=0, auto_stop_loss=0, max_consecutive_losses=0
+    )
+    session = _SimulatedSession(1000.0, bot.config.strategy.chance, seed)
+    bot.api.session = session
+    bot.sleep = lambda seconds: None
+    bot.fairness = RollFairnessMonitor()
+    
+    bot.stats['current_balance'] = session.balance
+    bot._begin_session()
+    bot.running = True
+    return bot, session
+
+def _soak_run(bot: DiceBot, session: _SimulatedSession, bets: int):
+    """Jalankan _run_loop sampai sejumlah bet tambahan"""
+    session.limit = session.calls + bets
+    session.on_limit = bot.stop_event.set
+    bot.stop_event.clear()
+    bot._run_loop()
+
+def _soak_chunks(bot: DiceBot, session: _SimulatedSession, count: int, chunk: int):
+    """Jalankan count bet dalam potongan chunk"""
+    done = 0
+    while done < count:
+        step = min(chunk, count - done)
+        _soak_run(bot, session, step)
+        done += step
+
+def run_soak(bets: int, seed: int = 0, chunk: int = 10000) -> Dict[str, float]:
+    """Soak test loop taruhan dengan API palsu, ukur memori dan GC per bet
+    
+    Memori tertahan diukur sebagai slope antara dua checkpoint setelah
+    warmup. tracemalloc sudah aktif sejak warmup, sehingga state berbatas
+    (deque latency, bucket window, kurva) sudah terisi objek yang dilacak di
+    checkpoint pertama dan penggantiannya netral; hanya pertumbuhan per bet
+    yang terhitung, berapa pun jumlah bet-nya.
+    """
+    if bets < SOAK_MIN_BETS:
+        raise ValueError(f"Soak needs at least {SOAK_MIN_BETS} bets")
+    warmup = min(max(bets // 10, 1000), bets)
+    
+    with contextlib.redirect_stdout(_NullWriter()):
+        ui = TerminalManager()
+        bot, session = _soak_bot(ui, seed)
+        
+        # Warmup: isi deque, cache dan interned string sebelum checkpoint pertama
+        tracemalloc.start()
+        _soak_run(bot, session, warmup)
+        gc.collect()
+        
+        rss_start = _rss_bytes()
+        objects_start = len(gc.get_objects())
+        blocks_start = sys.getallocatedblocks()
+        traced_start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        
+        measured = bets - warmup
+        with GCPauseTracker() as pauses:
+            _soak_chunks(bot, session, measured, chunk)
+        
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        traced_end, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        blocks_end = sys.getallocatedblocks()
+        objects_end = len(gc.get_objects())
+        rss_end = _rss_bytes()
+        bot.running = False
+    
+    measured = max(measured, 1)
+    return {
+        'bets': warmup + measured,
+        'measured_bets': measured,
+        'bytes_per_bet': (traced_end - traced_start) / measured,
+        'blocks_per_bet': (blocks_end - blocks_start) / measured,
+        'traced_peak_kb': traced_peak / 1024,
+        'object_growth': objects_end - objects_start,
+        'rss_growth_mb': (rss_end - rss_start) / (1024 * 1024),
+        'gc_gen0': pauses.pauses[0],
+        'gc_gen1': pauses.pauses[1],
+        'gc_gen2': pauses.pauses[2],
+        'gc_pause_total_ms': pauses.total * 1000,
+        'gc_pause_max_ms': pauses.longest * 1000,
+        'bets_per_second': measured / elapsed if elapsed > 0 else 0.0,
+    }
+
+def run_soak_command(args: argparse.Namespace) -> int:
+    """Subcommand soak: gagal jika alokasi per bet atau pertumbuhan memori melewati budget"""
+    ui = TerminalManager()
+    ui.print_log(f"Soak testing {args.bets:,} simulated bets...", "🧪", "blue")
+    result = run_soak(args.bets, args.seed)
+    
+    lines = [
+        f"Bets: {result['bets']:,} (measured {result['measured_bets']:,})",
+        f"Retained bytes/bet: {result['bytes_per_bet']:.3f} (budget {args.max_bytes_per_bet})",
+        f"Retained blocks/bet: {result['blocks_per_bet']:.4f}",
+        f"Traced peak: {result['traced_peak_kb']:.0f} KB",
+        f"Object growth: {result['object_growth']}",
+        f"RSS growth: {result['rss_growth_mb']:.1f} MB (budget {args.max_rss_growth_mb})",
+        f"GC collections: gen0 {result['gc_gen0']} / gen1 {result['gc_gen1']} / gen2 {result['gc_gen2']}",
+        f"GC pause: total {result['gc_pause_total_ms']:.1f} ms, max {result['gc_pause_max_ms']:.2f} ms",
+        f"Throughput (with tracemalloc): {result['bets_per_second']:,.0f} bets/s",
+    ]
+    print(ui.create_box("🧪 SOAK TEST", "\n".join(lines)))
+    
+    failed = []
+    if result['bytes_per_bet'] > args.max_bytes_per_bet:
+        failed.append("bytes/bet")
+    if result['rss_growth_mb'] > args.max_rss_growth_mb:
+        failed.append("RSS growth")
+    
+    if failed:
+        ui.print_log(f"Budget exceeded: {', '.join(failed)}", "❌", "red")
+        return 1
+    
+    ui.print_log("Within memory budget", "✅", "green")
+    return 0
+
+def freeze_startup_objects():
+    """Pindahkan objek startup ke generasi permanen agar tidak dipindai GC lagi"""
+    gc.collect()
+    gc.freeze()
+
 # ============== MAIN APPLICATION ==============
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse argumen command line"""
+    parser = argparse.ArgumentParser(description=f"Crypto.Games Dice Bot v{VERSION}")
+    parser.add_argument(
+        "--isolated", action="store_true",
+        help="Jalankan betting engine di proses terpisah (stats via shared memory)"
+    )
+    parser.add_argument(
+        "--engine", choices=["thread", "async"], default="thread",
+        help="Backend loop taruhan: thread (default) atau async (butuh aiohttp)"
+    )
+    parser.add_argument(
+        "--shadow", action="store_true",
+        help="Evaluasi preset lain secara shadow atas stream roll live"
+    )
+    parser.add_argument(
+        "--gc-freeze", action="store_true",
+        help="Bekukan objek startup dari GC (gc.freeze) untuk sesi berhari-hari"
+    )
+    parser.add_argument(
+        "--no-fairness", action="store_true",
+        help="Matikan monitor fairness stream roll"
+    )
+    parser.add_argument(
+        "--no-status", action="store_true",
+        help="Jangan publikasikan status live untuk 'cgbot top'"
+    )
+    parser.add_argument(
+        "--hook", action="append", default=[], metavar="SPEC",
+        help="Subscriber event: jsonl:FILE, webhook:URL atau exec:COMMAND, "
+             "opsional filter event mis. webhook[stop,error]:URL (bisa diulang)"
+    )
+    parser.add_argument(
+        "--record", metavar="FILE",
+        help="Rekam setiap hasil bet ke FILE (JSON lines) untuk replay"
+    )
+    
+    commands = parser.add_subparsers(dest="command")
+    
+    replay = commands.add_parser("replay", help="Replay stream roll rekaman dengan preset tertentu")
+    replay.add_argument("file", help="File rekaman dari --record")
+    replay.add_argument("--preset", type=int, default=None, help="Nomor preset (1-10), default strategi tersimpan")
+    replay.add_argument("--balance", type=float, default=None, help="Balance awal, default dari rekaman")
+    replay.add_argument("--json", action="store_true", help="Cetak stats akhir sebagai JSON")
+    
+    top = commands.add_parser("top", help="Tampilkan status live semua instance bot di host ini")
+    top.add_argument("--interval", type=float, default=0.25, help="Interval refresh (detik)")
+    top.add_argument("--once", action="store_true", help="Tampilkan sekali lalu keluar")
+    
+    soak = commands.add_parser("soak", help="Soak test loop taruhan dengan API palsu dan budget memori")
+    soak.add_argument("--bets", type=int, default=200000, help=f"Jumlah bet simulasi (minimal {SOAK_MIN_BETS})")
+    soak.add_argument("--seed", type=int, default=0, help="Seed RNG API palsu")
+    soak.add_argument("--max-bytes-per-bet", type=float, default=1.0, help="Budget memori tertahan per bet (byte)")
+    soak.add_argument("--max-rss-growth-mb", type=float, default=16.0, help="Budget pertumbuhan RSS (MB)")
+    
+    orchestrate = commands.add_parser("orchestrate", help="Jalankan banyak sesi (akun x coin) dengan batas risiko portfolio")
+    orchestrate.add_argument("file", help="Config JSON berisi 'sessions' dan 'limits' per coin")
+    
+    bench = commands.add_parser("bench", help="Micro-benchmark hot path engine terhadap baseline")
+    bench.add_argument("--baseline", default=BENCH_BASELINE_FILE, help="File baseline (dibuat jika belum ada)")
+    bench.add_argument("--save", action="store_true", help="Timpa baseline dengan hasil sekarang")
+    bench.add_argument("--threshold", type=float, default=0.25, help="Batas regresi relatif (default 0.25 = 25%%)")
+    bench.add_argument("--iterations", type=int, default=10000, help="Iterasi per ulangan")
+    bench.add_argument("--repeats", type=int, default=9, help="Jumlah ulangan, diambil yang tercepat")
+    
+    args = parser.parse_args(argv)
+    if args.command == "soak" and args.bets < SOAK_MIN_BETS:
+        soak.error(f"--bets must be at least {SOAK_MIN_BETS}")
+    return args
+
+def run_replay_command(args: argparse.Namespace) -> int:
+    """Subcommand replay: putar ulang rekaman secepat mungkin"""
+    if args.json:
+        # stdout khusus untuk JSON, log dialihkan ke stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            stats = _replay(args)
+        if stats is None:
+            return 1
+        # Field wall-clock dibuang agar output bisa dibandingkan bit-for-bit
+        wall_clock = ('start_time', 'session_time', 'bets_per_second')
+        print(json.dumps({k: v for k, v in stats.items() if k not in wall_clock}, sort_keys=True))
+        return 0
+    
+    return 0 if _replay(args) is not None else 1
+
+def _replay(args: argparse.Namespace) -> Optional[Dict]:
+    """Jalankan replay sesuai argumen, None jika gagal"""
+    ui = TerminalManager()
+    bot = DiceBot(ui)
+    
+    if args.preset is not None:
+        if args.preset not in DiceBot.PRESET_STRATEGIES:
+            ui.print_log("Invalid strategy number", "❌", "red")
+            return None
+        bot.config.strategy = DiceBot.PRESET_STRATEGIES[args.preset]
+    
+    try:
+        records = ReplayAPI.load_records(args.file)
+    except OSError as e:
+        ui.print_log(f"Cannot read recording: {e.strerror}", "❌", "red")
+        return None
+    except json.JSONDecodeError as e:
+        ui.print_log(f"Invalid recording JSON at line {e.lineno}", "❌", "red")
+        return None
+    
+    try:
+        rolls = [float(r['roll']) for r in records]
+        balance = args.balance
+        if balance is None and records:
+            first = records[0]
+            balance = round(first['balance'] - first['profit'], 8)
+    except (KeyError, TypeError, ValueError) as e:
+        ui.print_log(f"Malformed recording: {e!r}", "❌", "red")
+        return None
+    if not records:
+        ui.print_log("Recording is empty", "❌", "red")
+        return None
+    
+    api = ReplayAPI(rolls, balance, lambda: bot.config.strategy.chance)
+    
+    started = time.perf_counter()
+    stats = bot.run_replay(api)
+    elapsed = time.perf_counter() - started
+    
+    ui.print_stats(stats, bot.curve)
+    ui.print_windows(bot.rolling.snapshots())
+    rate = stats['total_bets'] / elapsed * 60 if elapsed > 0 else 0.0
+    ui.print_log(f"Replayed {stats['total_bets']} of {len(records)} rolls in {elapsed:.2f}s ({rate:,.0f} bets/min)", "⏩", "cyan")
+    return stats
+
 def main():
     """Fungsi utama"""
+    args = parse_args()
+    
+    if args.command == "replay":
+        sys.exit(run_replay_command(args))
+    if args.command == "bench":
+        sys.exit(run_bench_command(args))
+    if args.command == "orchestrate":
+        sys.exit(run_orchestrate_command(args))
+    if args.command == "top":
+        sys.exit(run_top_command(args))
+    if args.command == "soak":
+        sys.exit(run_soak_command(args))
+    
     def signal_handler(sig, frame):
         print("\n\nInterrupted by user. Exiting...")
         sys.exit(0)
@@ -1060,9 +4168,59 @@ def main():
     
     # Initialize terminal manager
     ui = TerminalManager()
-    bot = DiceBot(ui)
     
-    # Main loop
+    try:
+        for spec in args.hook:
+            parse_hook_spec(spec)
+    except ValueError as e:
+        ui.print_log(str(e), "❌", "red")
+        sys.exit(2)
+    
+    engine = None
+    if args.isolated:
+        if args.engine == "async" and aiohttp is None:
+            ui.print_log("Async engine requires aiohttp (pip install aiohttp)", "❌", "red")
+            sys.exit(2)
+        # Hook, file status, monitor fairness dan engine async dijalankan oleh proses engine
+        bot = IsolatedDiceBot(ui, args.hook, status=not args.no_status,
+                              fairness=not args.no_fairness, gc_freeze=args.gc_freeze,
+                              engine_name=args.engine)
+    else:
+        if args.engine == "async":
+            engine = AsyncEngine()
+        bot = DiceBot(ui, engine)
+        bot.hooks = build_hook_bus(args.hook)
+    
+    if args.isolated and (args.record or args.shadow):
+        ui.print_log("--record and --shadow are not supported with --isolated", "⚠️", "yellow")
+    elif args.record:
+        bot.recorder = open(args.record, 'a')
+    
+    bot.shadow_enabled = args.shadow and not args.isolated
+    
+    # Di mode --isolated file status dipublikasikan oleh proses engine
+    if not args.no_status and not args.isolated:
+        bot.enable_status()
+    
+    if not args.no_fairness and not args.isolated:
+        bot.fairness = RollFairnessMonitor()
+    
+    if args.gc_freeze:
+        freeze_startup_objects()
+    
+    # kill -USR1 <pid> memicu profiler tanpa menyentuh terminal
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, lambda sig, frame: bot.start_profiler())
+    
+    try:
+        run_menu(ui, bot)
+    finally:
+        bot.shutdown()
+        if engine is not None:
+            engine.close()
+
+def run_menu(ui: TerminalManager, bot: DiceBot):
+    """Loop menu interaktif"""
     while True:
         try:
             ui.print_header()
@@ -1099,6 +4257,14 @@ def main():
             elif choice == '8':
                 continue
             
+            elif choice.lower() == 'b':
+                bot.view_portfolio()
+            
+            elif choice.lower() == 'p':
+                seconds = ui.get_float_input("Profile duration (seconds)", PROFILE_DEFAULT_SECONDS, 1, 600)
+                bot.start_profiler(seconds)
+                input("\nPress Enter to continue...")
+            
             elif choice == '9':
                 if bot.running:
                     bot.stop()
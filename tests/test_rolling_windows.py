@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+import cgbot
+
+
+def make_bot(**strategy):
+    bot = cgbot.DiceBot(cgbot.TerminalManager(), load_saved=False)
+    bot.config.strategy = cgbot.Strategy(**strategy)
+    bot.stats['current_balance'] = 0.001
+    bot.initial_balance = 0.001
+    return bot
+
+
+def test_window_stop_expires_before_restart():
+    bot = make_bot(stop_window="1m", auto_stop_profit=0.00001, auto_stop_loss=0.00001)
+    now = time.time()
+
+    bot.rolling.add(now, 0.00002, 0.00001, True)
+    assert bot.check_stop_conditions() is False
+
+    # Restart 10 menit kemudian: profit 1m sudah keluar dari window
+    bot.now = lambda: now + 600
+    assert bot.check_stop_conditions() is True
+
+
+def test_daily_target_rolls_over_after_24h():
+    bot = make_bot(strategy_type="daily_target", auto_stop_profit=0, auto_stop_loss=0)
+    now = time.time()
+
+    bot.rolling.add(now, 0.0002, 0.0001, True)
+    assert bot.check_stop_conditions() is False
+
+    bot.now = lambda: now + 2 * 86400
+    assert bot.check_stop_conditions() is True
+    assert bot.daily_window(0.001) == (0.0, 0.0001)
+
+
+def test_profit_at_matches_snapshot():
+    window = cgbot.RollingWindow("t", 60, 12)
+    for second in range(300):
+        window.add(1000.0 + second, 1.0, 1.0, True)
+    assert window.profit_at(1299.0) == window.snapshot(1299.0)['profit']
+    assert window.profit_at(1330.0) == window.snapshot(1330.0)['profit']
+    assert window.profit_at(2000.0) == 0.0
+
+
+def test_unknown_stop_window_is_rejected():
+    bot = make_bot()
+    with pytest.raises(ValueError):
+        bot.apply_config_dict({'api_key': 'key', 'strategy': {'stop_window': '2h'}})
+    assert bot.config.api_key == ""
+
+    # Strategi yang sudah terpasang tetap ditolak sebelum loop berjalan
+    bot.config.api_key = "key"
+    bot.config.strategy = cgbot.Strategy(stop_window="2h")
+    bot.start()
+    assert bot.running is False